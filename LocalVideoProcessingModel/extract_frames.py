@@ -1,7 +1,6 @@
 """
 Simple script to extract frames from a video file for testing
 """
-import cv2
 import os
 import sys
 
@@ -14,6 +13,8 @@ def extract_frames(video_path, output_folder, num_frames=5):
         output_folder: Directory to save extracted frames
         num_frames: Number of frames to extract (default: 5)
     """
+    import cv2
+
     # Check if video exists
     if not os.path.exists(video_path):
         print(f"Error: Video file not found: {video_path}")
@@ -68,7 +69,7 @@ def extract_frames(video_path, output_folder, num_frames=5):
     return True
 
 
-if __name__ == "__main__":
+def main():
     # Default paths
     video_folder = "videos"
     output_folder = "test_images"
@@ -105,3 +106,7 @@ if __name__ == "__main__":
     
     # Extract frames
     extract_frames(video_path, output_folder, num_frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""
+Pipeline-ul de detecție a parcărilor ilegale
+
+Modulele nu importă OpenCV, Gemini, PIL sau requests la import - acestea se încarcă
+la prima utilizare, ca procesele worker să pornească repede.
+
+Puncte de intrare (fiecare cu main()):
+    python -m parking_detector.live                 # stream live IP Webcam
+    python -m parking_detector.snapshot --camera id=url   # snapshot-uri, mai multe camere
+    python -m parking_detector.offline videos/      # înregistrări video
+    python -m parking_detector.simulate_scheduler   # planificare fixă vs. adaptivă
+    python -m parking_detector.simulate_pipeline    # cozi și circuite la pene simulate
+    python -m parking_detector.compare_prompts      # cost / latență pe variantă de prompt
+"""
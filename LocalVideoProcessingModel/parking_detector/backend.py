@@ -0,0 +1,235 @@
+"""
+Raportarea încălcărilor: deduplicare + trimitere la backend
+"""
+import os
+import time
+from datetime import datetime
+
+from .dedup import (
+    is_same_sighting,
+    is_vehicle_recently_reported,
+    plate_sightings,
+    remember_plate_sighting,
+    reported_vehicles,
+)
+from .geocoding import get_address_from_coords
+from .normalization import canonicalize_plate, format_plate, is_valid_plate
+from .parsing import (
+    extract_plate_number,
+    extract_vehicle_description,
+    generate_vehicle_id,
+    normalize_vehicle_description,
+)
+
+BACKEND_URL = "http://localhost:3000/api/incidents"
+BACKEND_TIMEOUT = 10
+
+
+# Funcție pentru a trimite incidentul la backend
+def send_incident_to_backend(ai_response, frame, plate_number, latitude, longitude, incident_time=None,
+                             address=None):
+    """
+    Trimite incidentul detectat la backend (frame: imagine OpenCV sau octeții JPEG)
+
+    Args:
+        address: (stradă, district) deja obținute (pipeline-ul geocodează într-o etapă separată)
+    """
+    import requests
+
+    try:
+        # Verifică dacă avem coordonate GPS
+        if not latitude or not longitude:
+            print("❌ Nu pot trimite incident fără coordonate GPS")
+            return False
+
+        incident_time = incident_time or datetime.now()
+
+        # Obține adresa și districtul din coordonatele GPS
+        if address is None:
+            print("🗺️ Se obține adresa din coordonate GPS...")
+            address = get_address_from_coords(latitude, longitude)
+        street, district = address
+        print(f"✓ Adresă: {street}, District: {district}")
+
+        # Creează directorul pentru imagini dacă nu există
+        images_dir = "frame_image_localDB"
+        os.makedirs(images_dir, exist_ok=True)
+
+        # Salvează frame-ul în directorul dedicat
+        timestamp = incident_time.strftime('%Y%m%d_%H%M%S')
+        frame_filename = f"incident_{timestamp}.jpg"
+        frame_path = os.path.join(images_dir, frame_filename)
+        if isinstance(frame, (bytes, bytearray)):
+            # JPEG-ul primit de la cameră (modul snapshot) se salvează fără recodare
+            with open(frame_path, "wb") as f:
+                f.write(frame)
+        else:
+            import cv2
+            cv2.imwrite(frame_path, frame)
+        print(f"📸 Imagine salvată: {frame_path}")
+
+        # Extrage informațiile din răspunsul AI
+        incident_data = {
+            "address": street,
+            "district": district,
+            "latitude": latitude,
+            "longitude": longitude,
+            "datetime": incident_time.isoformat(),
+            "ai_description": ai_response,
+            "car_number": plate_number,
+            "photos": [frame_path]  # Path relativ: frame_image_localDB/incident_YYYYMMDD_HHMMSS.jpg
+        }
+
+        # Trimite la backend
+        response = requests.post(
+            BACKEND_URL,
+            json=incident_data,
+            headers={"Content-Type": "application/json"},
+            timeout=BACKEND_TIMEOUT
+        )
+
+        if response.status_code == 201:
+            print(f"✓ Incident trimis la backend: {response.json()}")
+            return True
+        else:
+            print(f"❌ Eroare la trimiterea incidentului: {response.text}")
+            return False
+    except Exception as e:
+        print(f"❌ Eroare la trimiterea incidentului: {e}")
+        return False
+
+
+def is_known_plate(local_plate, latitude, longitude, now=None, reported=None, sightings=None):
+    """
+    Verifică numărul citit local (plate_ocr) înainte de apelul la model
+
+    Frame-ul poate conține mai multe vehicule, deci un număr deja raportat nu ajunge:
+    plăcuța trebuie văzută de aceeași cameră, în aceeași poziție ca la raportare.
+
+    Returns:
+        True dacă este aceeași încălcare, raportată recent - analiza modelului nu mai e necesară
+    """
+    if local_plate is None:
+        return False
+    if not is_same_sighting(local_plate.plate, latitude, longitude, local_plate.box, sightings):
+        return False
+    return is_vehicle_recently_reported(
+        local_plate.plate,
+        f"număr {format_plate(local_plate.plate)}, OCR local {local_plate.confidence:.2f}",
+        now=now,
+        reported=reported
+    )
+
+
+def _mark_reported(vehicle_id, now, reported, sightings, local_plate, latitude, longitude):
+    """Vehiculul intră în evidență; pentru numărul citit local se reține și poziția plăcuței"""
+    reported[vehicle_id] = now
+    if local_plate is not None and local_plate.plate == vehicle_id:
+        remember_plate_sighting(vehicle_id, latitude, longitude, local_plate.box, sightings, reported)
+
+
+def handle_gemini_result(result, frame, latitude, longitude, now=None, reported=None,
+                         incident_time=None, submit=True, local_plate=None, send=None, sightings=None):
+    """
+    Procesează răspunsul Gemini: detectează încălcarea, verifică duplicatele și raportează
+
+    Args:
+        local_plate: PlateReading din plate_ocr; când modelul nu a putut citi numărul, citirea
+            locală este doar cheia de deduplicare (neverificată, nu se trimite ca car_number)
+        send: În loc de trimiterea directă, send(vehicle_id, result, frame, plate_number, latitude,
+            longitude, incident_time) pune incidentul în coada pipeline-ului și returnează True/False
+        sightings: Pozițiile numerelor raportate, pentru is_known_plate (implicit cele globale)
+
+    Returns:
+        "none" (fără încălcare), "duplicate", "reported", "failed", "skipped" (submit=False)
+        sau "queued" (send)
+    """
+    if reported is None:
+        reported = reported_vehicles
+    if sightings is None:
+        sightings = plate_sightings
+    now = time.time() if now is None else now
+
+    # Verifică dacă este o încălcare
+    if "ÎNCĂLCARE: DA" not in result and "INCALCARE: DA" not in result:
+        return "none"
+
+    # Extrage numărul de înmatriculare (forma canonică: "TM 12 ABC" și "TM12ABC" sunt același vehicul)
+    plate_key = canonicalize_plate(extract_plate_number(result))
+    plate_number = format_plate(plate_key)
+    if local_plate is not None:
+        if not is_valid_plate(plate_key):
+            # Modelul a răspuns "necitibil" (sau un număr invalid) - citirea locală e doar cheia de
+            # deduplicare; incidentul pleacă fără număr, pentru că nimeni nu a confirmat citirea
+            print(f"🔎 Număr citit local (neverificat): {local_plate.plate} "
+                  f"(încredere {local_plate.confidence:.2f})")
+            plate_key = local_plate.plate
+            plate_number = None
+        elif plate_key != local_plate.plate:
+            print(f"⚠️ OCR local ({local_plate.plate}) diferă de model ({plate_key}) - se păstrează modelul")
+    if plate_key and not is_valid_plate(plate_key):
+        # Ex: "TM 12 ABC (parțial)" -> "TM12ABCPARTIAL" - nu e un număr, deci nici cheie, nici car_number;
+        # deduplicarea trece pe locație + descriere
+        print(f"⚠️ Numărul {plate_key} nu respectă formatul românesc - se ignoră")
+        plate_key = None
+        plate_number = None
+    vehicle_description = extract_vehicle_description(result)
+
+    # Extrage culoarea pentru matching mai bun
+    normalized_desc = normalize_vehicle_description(vehicle_description)
+    color = normalized_desc.split('_')[0] if normalized_desc and '_' in normalized_desc else None
+
+    # Determină ID-ul vehiculului pentru tracking duplicat
+    if plate_key:
+        # Dacă avem număr de înmatriculare, folosim acesta
+        vehicle_id = plate_key
+        identifier_type = f"număr {format_plate(plate_key)}"
+        check_location = False
+    else:
+        # Dacă nu avem număr, folosim locație + descriere
+        vehicle_id = generate_vehicle_id(latitude, longitude, vehicle_description)
+        identifier_type = f"locație+descriere ({normalized_desc})"
+        check_location = True
+
+    print(f"🔍 Verificare duplicat pentru: {vehicle_id}")
+
+    # Verifică dacă vehiculul a fost deja raportat recent
+    is_duplicate = is_vehicle_recently_reported(
+        vehicle_id,
+        identifier_type,
+        lat=latitude if check_location else None,
+        lon=longitude if check_location else None,
+        color=color if check_location else None,
+        now=now,
+        reported=reported
+    )
+
+    if is_duplicate:
+        print(f"⏭️ Incident ignorat - vehicul deja raportat recent")
+        return "duplicate"
+
+    if not submit:
+        # Mod de revizuire: marcăm vehiculul ca raportat fără a trimite la backend
+        _mark_reported(vehicle_id, now, reported, sightings, local_plate, latitude, longitude)
+        print(f"🚨 Încălcare detectată (netrimisă): {vehicle_id}")
+        return "skipped"
+
+    if send is not None:
+        # Vehiculul se marchează de acum, ca detecțiile următoare să nu dubleze incidentul din coadă;
+        # pipeline-ul îl scoate din evidență dacă trimiterea eșuează definitiv
+        _mark_reported(vehicle_id, now, reported, sightings, local_plate, latitude, longitude)
+        if not send(vehicle_id, result, frame, plate_number, latitude, longitude, incident_time):
+            reported.pop(vehicle_id, None)
+            return "failed"
+        print(f"🚨 Încălcare detectată, incident în coada de trimitere: {vehicle_id}")
+        return "queued"
+
+    print("🚨 Încălcare detectată! Se trimite la backend...")
+    success = send_incident_to_backend(result, frame, plate_number, latitude, longitude, incident_time)
+    # Marchează vehiculul ca raportat doar dacă trimiterea a reușit
+    if success:
+        _mark_reported(vehicle_id, now, reported, sightings, local_plate, latitude, longitude)
+        print(f"✓ Vehicul marcat ca raportat: {vehicle_id}")
+        print(f"📋 Total vehicule în tracking: {len(reported)}")
+        return "reported"
+    return "failed"
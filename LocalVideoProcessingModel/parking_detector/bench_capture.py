@@ -0,0 +1,233 @@
+"""
+Benchmark: stream continuu (/video) vs. snapshot-uri (/shot.jpg) per cameră
+
+Un server local (proces separat) imită IP Webcam: /video trimite MJPEG la `fps`
+frame-uri pe secundă, /shot.jpg o singură imagine. Scena se schimbă la fiecare
+`change_every` secunde. Ambele moduri analizează câte un frame la `interval` secunde
+cu ChangeGate; frame-urile care trec de gate sunt pregătite pentru model
+(stream: encode_jpeg, snapshot: octeții primiți, fără recodare).
+
+Raportează CPU-ul clientului (% dintr-un nucleu), traficul și conexiunile TCP per cameră.
+"""
+import argparse
+import os
+import threading
+import time
+
+from .change_gate import ChangeGate
+from .gemini_client import encode_jpeg
+from .snapshot import create_session, decode_gate_frame, fetch_snapshot
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_IMAGE = os.path.join(PROJECT_DIR, "car_1.jpeg")
+BOUNDARY = "stubcamframe"
+
+
+def _scene_variants(image_path, count=4):
+    """JPEG-uri ale aceleiași scene cu un "vehicul" (dreptunghi) în poziții diferite"""
+    import cv2
+
+    image = cv2.imread(image_path)
+    if image is None:
+        raise FileNotFoundError(f"Nu pot citi imaginea {image_path}")
+    height, width = image.shape[:2]
+    variants = []
+    for index in range(count):
+        frame = image.copy()
+        x = int(width * (0.1 + 0.2 * index))
+        y = int(height * 0.6)
+        cv2.rectangle(frame, (x, y), (x + width // 5, y + height // 8), (40, 40, 200), -1)
+        variants.append(encode_jpeg(frame))
+    return variants
+
+
+def _serve_stub_camera(port, image_path, fps, change_every, counters, ready):
+    """Serverul camerei stub (rulează în procesul propriu)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    variants = _scene_variants(image_path)
+    lock = threading.Lock()
+
+    def current_jpeg():
+        return variants[int(time.time() // change_every) % len(variants)]
+
+    def count(name, value):
+        with lock:
+            counters[name] += value
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def setup(self):
+            super().setup()
+            count("connections", 1)
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path == "/shot.jpg":
+                jpeg = current_jpeg()
+                self.send_response(200)
+                self.send_header("Content-Type", "image/jpeg")
+                self.send_header("Content-Length", str(len(jpeg)))
+                self.end_headers()
+                self.wfile.write(jpeg)
+                count("bytes", len(jpeg))
+                count("frames", 1)
+            elif self.path == "/video":
+                self.send_response(200)
+                self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                next_frame = time.perf_counter()
+                try:
+                    while True:
+                        jpeg = current_jpeg()
+                        self.wfile.write(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                         f"Content-Length: {len(jpeg)}\r\n\r\n".encode())
+                        self.wfile.write(jpeg)
+                        self.wfile.write(b"\r\n")
+                        count("bytes", len(jpeg))
+                        count("frames", 1)
+                        next_frame += 1.0 / fps
+                        time.sleep(max(0.0, next_frame - time.perf_counter()))
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                self.close_connection = True
+            else:
+                self.send_error(404)
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    ready.set()
+    server.serve_forever()
+
+
+def _stream_camera(url, interval, deadline, stats):
+    """Modul stream: decodăm fiecare frame, analizăm unul la `interval` secunde"""
+    import cv2
+
+    cap = cv2.VideoCapture(url)
+    gate = ChangeGate()
+    last_analysis = None
+    while time.time() < deadline:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        stats["decoded"] += 1
+        now = time.time()
+        if last_analysis is None or now - last_analysis >= interval:
+            last_analysis = now
+            stats["checks"] += 1
+            if gate.should_analyze(frame, now):
+                stats["to_model"] += 1
+                stats["model_bytes"] += len(encode_jpeg(frame))
+    cap.release()
+
+
+def run_stream(base_url, cameras, interval, duration, stats):
+    deadline = time.time() + duration
+    threads = [threading.Thread(target=_stream_camera, args=(f"{base_url}/video", interval, deadline, stats))
+               for _ in range(cameras)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+async def _snapshot_loop(base_url, cameras, interval, duration, stats):
+    import asyncio
+
+    session = create_session(pool_size=cameras)
+    gates = [ChangeGate() for _ in range(cameras)]
+    url = f"{base_url}/shot.jpg"
+
+    async def check(gate, now):
+        jpeg = await asyncio.to_thread(fetch_snapshot, session, url)
+        if jpeg is None:
+            return
+        stats["decoded"] += 1
+        stats["checks"] += 1
+        if gate.should_analyze(decode_gate_frame(jpeg), now):
+            stats["to_model"] += 1
+            stats["model_bytes"] += len(jpeg)  # trimis direct, fără recodare
+
+    deadline = time.time() + duration
+    while time.time() < deadline:
+        started = time.time()
+        await asyncio.gather(*(check(gate, started) for gate in gates))
+        await asyncio.sleep(max(0.0, interval - (time.time() - started)))
+    session.close()
+
+
+def run_snapshot(base_url, cameras, interval, duration, stats):
+    import asyncio
+
+    asyncio.run(_snapshot_loop(base_url, cameras, interval, duration, stats))
+
+
+def measure(mode, base_url, counters, cameras, interval, duration):
+    """Rulează un mod și returnează metricile per cameră"""
+    stats = {"decoded": 0, "checks": 0, "to_model": 0, "model_bytes": 0}
+    for name in counters:
+        counters[name] = 0
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    (run_stream if mode == "stream" else run_snapshot)(base_url, cameras, interval, duration, stats)
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    return {
+        "cpu_percent": 100 * cpu / elapsed / cameras,
+        "kb_per_s": counters["bytes"] / 1024 / elapsed / cameras,
+        "frames_received": counters["frames"] / cameras,
+        "connections": counters["connections"] / cameras,
+        "decoded": stats["decoded"] / cameras,
+        "checks": stats["checks"] / cameras,
+        "to_model": stats["to_model"] / cameras,
+        "model_kb": stats["model_bytes"] / 1024 / max(stats["to_model"], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark captură: stream continuu vs. snapshot-uri")
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--fps", type=float, default=15, help="Frame-uri/s ale stream-ului stub")
+    parser.add_argument("--interval", type=float, default=10, help="Secunde între analize")
+    parser.add_argument("--duration", type=float, default=30, help="Secunde per mod")
+    parser.add_argument("--change-every", type=float, default=20, help="Secunde între schimbările scenei")
+    parser.add_argument("--image", default=DEFAULT_IMAGE, help="Imaginea servită de camera stub")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    import multiprocessing as mp
+
+    manager = mp.Manager()
+    counters = manager.dict(bytes=0, frames=0, connections=0)
+    ready = mp.Event()
+    server = mp.Process(target=_serve_stub_camera, daemon=True,
+                        args=(args.port, args.image, args.fps, args.change_every, counters, ready))
+    server.start()
+    ready.wait(timeout=30)
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    print(f"{args.cameras} camere, stream {args.fps:g} fps, analiză la {args.interval:g}s, "
+          f"{args.duration:g}s per mod\n")
+    print(f"{'Mod':<10}{'CPU %':>8}{'KB/s':>10}{'frame-uri':>11}{'decodate':>10}"
+          f"{'verificări':>12}{'la model':>10}{'KB/cerere':>11}{'conexiuni':>11}")
+    try:
+        for mode in ("stream", "snapshot"):
+            m = measure(mode, base_url, counters, args.cameras, args.interval, args.duration)
+            print(f"{mode:<10}{m['cpu_percent']:>8.1f}{m['kb_per_s']:>10.0f}{m['frames_received']:>11.0f}"
+                  f"{m['decoded']:>10.0f}{m['checks']:>12.0f}{m['to_model']:>10.0f}"
+                  f"{m['model_kb']:>11.0f}{m['connections']:>11.1f}")
+        print("\n(valori per cameră; CPU doar pentru procesul client)")
+    finally:
+        server.terminate()
+        manager.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Generator de încărcare pentru dashboard: incidente sintetice + latența interogărilor de analiză
+
+1. seed: inserează direct în MySQL/MariaDB incidente sintetice până la --rows (implicit 1M),
+   apoi reconstruiește incident_rollups (același SQL ca rebuildRollups din backend)
+2. sql: latența interogărilor vechi (scanare incidents) vs. cele pe incident_rollups
+3. stream: trimite incidente la POST /api/incidents cu --rate pe secundă și măsoară în
+   paralel GET /api/incidents/stats și /api/incidents/analytics; la final verifică
+   că rollup-urile au rămas egale cu COUNT(*) și cu suma amenzilor din incidents
+
+Conexiunea folosește aceleași variabile ca backend-ul (DB_HOST, DB_USER, DB_PASSWORD,
+DB_NAME). Necesită pymysql (în requirements.txt sau pip install pymysql) și, pentru stream, backend-ul pornit.
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from .backend import BACKEND_URL
+
+DISTRICTS = [
+    "Aradului", "Blașcovici", "Braytim", "Cetate", "Circumvalațiunii", "Complexul Studențesc",
+    "Elisabetin", "Fabric", "Freidorf", "Girocului", "Iosefin", "Lipovei", "Mehala",
+    "Olimpia–Stadion", "Plopi", "Ronaț", "Soarelui", "Steaua", "Tipografilor", "Torontalului",
+]
+STATUSES = ["pending", "resolved_and_fined", "resolved", "rejected"]
+STATUS_WEIGHTS = [0.3, 0.35, 0.2, 0.15]
+
+INSERT_SQL = """INSERT INTO incidents
+    (address, district, latitude, longitude, datetime, ai_description, car_number, fine_id, status)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"""
+
+REBUILD_ROLLUPS_SQL = [
+    "DELETE FROM incident_rollups",
+    """INSERT INTO incident_rollups (day, district, status, incidents, revenue)
+       SELECT DATE(i.datetime), COALESCE(i.district, ''), i.status, COUNT(*),
+              SUM(CASE WHEN i.status = 'resolved_and_fined' THEN COALESCE(f.value, 0) ELSE 0 END)
+       FROM incidents i
+       LEFT JOIN fines f ON i.fine_id = f.id
+       GROUP BY DATE(i.datetime), COALESCE(i.district, ''), i.status""",
+]
+
+# Interogările de dinainte de rollups (getIncidentStats / getAnalytics) și echivalentele lor
+LEGACY_QUERIES = {
+    "stats": """SELECT COUNT(*), SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN status = 'resolved_and_fined' THEN 1 ELSE 0 END)
+                FROM incidents""",
+    "totaluri": """SELECT COUNT(*),
+                          SUM(CASE WHEN i.status = 'resolved_and_fined' THEN 1 ELSE 0 END),
+                          SUM(CASE WHEN i.status = 'resolved_and_fined' THEN COALESCE(f.value, 0) ELSE 0 END)
+                   FROM incidents i LEFT JOIN fines f ON i.fine_id = f.id
+                   WHERE i.datetime BETWEEN %(start)s AND %(end)s""",
+    "pe zile": """SELECT DATE_FORMAT(datetime, '%%b %%d'), COUNT(*) FROM incidents
+                  WHERE datetime BETWEEN %(start)s AND %(end)s
+                  GROUP BY DATE(datetime), DATE_FORMAT(datetime, '%%b %%d')
+                  ORDER BY DATE(datetime) DESC LIMIT 7""",
+    "pe cartiere": """SELECT district, COUNT(*) AS count FROM incidents
+                      WHERE datetime BETWEEN %(start)s AND %(end)s
+                      GROUP BY district HAVING district IS NOT NULL ORDER BY count DESC""",
+}
+ROLLUP_QUERIES = {
+    "stats": """SELECT SUM(incidents), SUM(CASE WHEN status = 'pending' THEN incidents ELSE 0 END),
+                       SUM(CASE WHEN status = 'resolved_and_fined' THEN incidents ELSE 0 END)
+                FROM incident_rollups""",
+    "totaluri": """SELECT SUM(incidents),
+                          SUM(CASE WHEN status = 'resolved_and_fined' THEN incidents ELSE 0 END),
+                          SUM(revenue)
+                   FROM incident_rollups WHERE day BETWEEN DATE(%(start)s) AND DATE(%(end)s)""",
+    "pe zile": """SELECT DATE_FORMAT(day, '%%b %%d'), SUM(incidents) AS violations FROM incident_rollups
+                  WHERE day BETWEEN DATE(%(start)s) AND DATE(%(end)s)
+                  GROUP BY day HAVING violations > 0 ORDER BY day DESC LIMIT 7""",
+    "pe cartiere": """SELECT district, SUM(incidents) AS count FROM incident_rollups
+                      WHERE day BETWEEN DATE(%(start)s) AND DATE(%(end)s) AND district <> ''
+                      GROUP BY district HAVING count > 0 ORDER BY count DESC""",
+}
+
+
+def connect():
+    """Conexiune la aceeași bază de date ca backend-ul"""
+    try:
+        import pymysql
+    except ImportError:
+        sys.exit("❌ bench_dashboard necesită pymysql: pip install -r requirements.txt (sau pip install pymysql)")
+
+    return pymysql.connect(
+        host=os.getenv("DB_HOST", "localhost"),
+        user=os.getenv("DB_USER", "root"),
+        password=os.getenv("DB_PASSWORD", ""),
+        database=os.getenv("DB_NAME", "latte_committers"),
+        charset="utf8mb4",
+    )
+
+
+def synthetic_incident(rng, days=365, now=None):
+    """Un incident sintetic, în formatul trimis de detector la POST /api/incidents"""
+    now = now or datetime.now()
+    district = rng.choice(DISTRICTS)
+    county = rng.choice(["TM", "AR", "CJ", "B"])
+    plate = f"{county} {rng.randint(10, 99)} {''.join(rng.choice('ABCDEFGHJKLMNPRSTUVWXYZ') for _ in range(3))}"
+    return {
+        "address": f"Strada {rng.randint(1, 400)} {rng.randint(1, 120)}",
+        "district": district if rng.random() > 0.02 else None,
+        "latitude": round(45.7489 + rng.uniform(-0.04, 0.04), 6),
+        "longitude": round(21.2087 + rng.uniform(-0.05, 0.05), 6),
+        "datetime": (now - timedelta(seconds=rng.uniform(0, days * 86400))).strftime("%Y-%m-%d %H:%M:%S"),
+        "ai_description": "ÎNCĂLCARE: DA\nDESCRIERE_VEHICUL: sintetic (bench_dashboard)",
+        "car_number": plate if rng.random() < 0.7 else None,
+        "photos": [],
+    }
+
+
+def seed(conn, rows, batch=5000, days=365, seed_value=42):
+    """Completează tabela incidents până la `rows` rânduri și reconstruiește rollup-urile"""
+    rng = random.Random(seed_value)
+    with conn.cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM incidents")
+        existing = cur.fetchone()[0]
+        cur.execute("SELECT id FROM fines")
+        fine_ids = [row[0] for row in cur.fetchall()]
+
+        missing = max(0, rows - existing)
+        print(f"📥 {existing} incidente existente, se inserează {missing}")
+        started = time.perf_counter()
+        now = datetime.now()
+        inserted = 0
+        while inserted < missing:
+            values = []
+            for _ in range(min(batch, missing - inserted)):
+                incident = synthetic_incident(rng, days, now)
+                status = rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+                fine_id = rng.choice(fine_ids) if fine_ids and status == "resolved_and_fined" else None
+                values.append((incident["address"], incident["district"], incident["latitude"],
+                               incident["longitude"], incident["datetime"], incident["ai_description"],
+                               incident["car_number"], fine_id, status))
+            cur.executemany(INSERT_SQL, values)
+            conn.commit()
+            inserted += len(values)
+            if inserted % 100_000 < batch:
+                print(f"   {inserted}/{missing} ({inserted / (time.perf_counter() - started):.0f} rânduri/s)")
+
+        print("🔄 Reconstruire incident_rollups...")
+        for statement in REBUILD_ROLLUPS_SQL:
+            cur.execute(statement)
+        conn.commit()
+
+
+def percentiles(samples):
+    """(p50, p95) în ms"""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0, 0.0
+    return (1000 * ordered[len(ordered) // 2],
+            1000 * ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))])
+
+
+def time_queries(conn, queries, params, repeat):
+    """Latența fiecărei interogări: {nume: (p50 ms, p95 ms)}"""
+    results = {}
+    with conn.cursor() as cur:
+        for name, sql in queries.items():
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                cur.execute(sql, params if "%(" in sql else None)
+                cur.fetchall()
+                samples.append(time.perf_counter() - started)
+            results[name] = percentiles(samples)
+    return results
+
+
+def _post_incidents(api, rate, deadline, stats, seed_value):
+    import requests
+
+    rng = random.Random(seed_value)
+    session = requests.Session()
+    next_post = time.perf_counter()
+    while time.time() < deadline:
+        started = time.perf_counter()
+        try:
+            response = session.post(api, json=synthetic_incident(rng, days=1), timeout=10)
+            stats["posted" if response.status_code == 201 else "errors"] += 1
+        except Exception:
+            stats["errors"] += 1
+        stats["post_latency"].append(time.perf_counter() - started)
+        next_post += 1.0 / rate
+        time.sleep(max(0.0, next_post - time.perf_counter()))
+
+
+def stream(api, rate, seconds, dashboard_interval, params, seed_value=7):
+    """Trimite incidente în fundal și măsoară endpoint-urile dashboard-ului între timp"""
+    import requests
+
+    stats = {"posted": 0, "errors": 0, "post_latency": []}
+    deadline = time.time() + seconds
+    poster = threading.Thread(target=_post_incidents, args=(api, rate, deadline, stats, seed_value))
+    poster.start()
+
+    session = requests.Session()
+    endpoints = {
+        "GET /stats": (f"{api}/stats", None),
+        "GET /analytics": (f"{api}/analytics", {"startDate": params["start"][:10], "endDate": params["end"][:10]}),
+        "GET /analytics (cartier)": (f"{api}/analytics", {"district": DISTRICTS[0]}),
+    }
+    latencies = {name: [] for name in endpoints}
+    while time.time() < deadline:
+        for name, (url, query) in endpoints.items():
+            started = time.perf_counter()
+            session.get(url, params=query, timeout=30).raise_for_status()
+            latencies[name].append(time.perf_counter() - started)
+        time.sleep(dashboard_interval)
+    poster.join()
+    return stats, {name: percentiles(samples) for name, samples in latencies.items()}
+
+
+def check_consistency(conn):
+    """
+    Compară rollup-urile cu calculul direct din incidents (număr și încasări pe status)
+
+    Returns:
+        Lista diferențelor (status, "incidente"/"încasări", valoarea din incidents, valoarea din rollups)
+    """
+    with conn.cursor() as cur:
+        cur.execute("""SELECT i.status, COUNT(*),
+                              SUM(CASE WHEN i.status = 'resolved_and_fined' THEN COALESCE(f.value, 0) ELSE 0 END)
+                       FROM incidents i LEFT JOIN fines f ON i.fine_id = f.id
+                       GROUP BY i.status""")
+        actual = {status: (int(count), revenue or 0) for status, count, revenue in cur.fetchall()}
+        cur.execute("SELECT status, SUM(incidents), SUM(revenue) FROM incident_rollups GROUP BY status")
+        rolled = {status: (int(count), revenue or 0) for status, count, revenue in cur.fetchall()}
+
+    differences = []
+    for status in sorted(set(actual) | set(rolled)):
+        actual_count, actual_revenue = actual.get(status, (0, 0))
+        rolled_count, rolled_revenue = rolled.get(status, (0, 0))
+        if actual_count != rolled_count:
+            differences.append((status, "incidente", actual_count, rolled_count))
+        # revenue e DECIMAL(14,2): comparăm la nivel de bani
+        if abs(float(actual_revenue) - float(rolled_revenue)) >= 0.005:
+            differences.append((status, "încasări", actual_revenue, rolled_revenue))
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generator de încărcare și latența dashboard-ului")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Numărul de incidente din tabelă")
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=365, help="Intervalul de date al incidentelor sintetice")
+    parser.add_argument("--repeat", type=int, default=10, help="Repetări per interogare SQL")
+    parser.add_argument("--api", default=BACKEND_URL, help="URL-ul API-ului de incidente")
+    parser.add_argument("--rate", type=float, default=20, help="Incidente trimise pe secundă")
+    parser.add_argument("--seconds", type=float, default=30, help="Durata fazei de stream")
+    parser.add_argument("--dashboard-interval", type=float, default=0.5)
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--skip-stream", action="store_true")
+    args = parser.parse_args()
+
+    conn = connect()
+    today = date.today()
+    params = {"start": f"{today - timedelta(days=30)} 00:00:00", "end": f"{today} 23:59:59"}
+
+    if not args.skip_seed:
+        seed(conn, args.rows, args.batch, args.days)
+
+    with conn.cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM incidents")
+        rows = cur.fetchone()[0]
+    print(f"\n⏱ Latența interogărilor la {rows} incidente (ultimele 30 de zile, {args.repeat} repetări)")
+    legacy = time_queries(conn, LEGACY_QUERIES, params, args.repeat)
+    rollup = time_queries(conn, ROLLUP_QUERIES, params, args.repeat)
+    print(f"{'Interogare':<14}{'scanare p50':>13}{'p95':>9}{'rollups p50':>13}{'p95':>9}")
+    for name in LEGACY_QUERIES:
+        print(f"{name:<14}{legacy[name][0]:>13.1f}{legacy[name][1]:>9.1f}{rollup[name][0]:>13.2f}{rollup[name][1]:>9.2f}")
+
+    if not args.skip_stream:
+        print(f"\n📡 Stream: {args.rate:g} incidente/s timp de {args.seconds:g}s către {args.api}")
+        stats, latencies = stream(args.api, args.rate, args.seconds, args.dashboard_interval, params)
+        post_p50, post_p95 = percentiles(stats["post_latency"])
+        print(f"POST /incidents: {stats['posted']} create, {stats['errors']} erori, "
+              f"p50 {post_p50:.1f} ms, p95 {post_p95:.1f} ms")
+        for name, (p50, p95) in latencies.items():
+            print(f"{name:<26} p50 {p50:.1f} ms, p95 {p95:.1f} ms")
+
+    conn.commit()  # snapshot nou după stream (REPEATABLE READ)
+    differences = check_consistency(conn)
+    if differences:
+        for status, metric, actual, rolled in differences:
+            print(f"❌ {status} ({metric}): incidents {actual}, incident_rollups {rolled}")
+    else:
+        print("\n✓ incident_rollups corespunde cu incidents")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark: frame-uri prin Queue (pickle) vs. FrameRing (memorie partajată)
+
+Mai multe procese "cameră" produc frame-uri 1080p, iar câteva procese de analiză le
+consumă. În ambele moduri producătorul scrie pixelii o dată (simulând decodarea);
+în modul pickle frame-ul este apoi serializat prin Queue, în modul shm prin Queue
+circulă doar FrameRef. Raportează frame-uri/secundă, CPU per frame și suprascrieri.
+"""
+import argparse
+import multiprocessing as mp
+import time
+
+from .frame_ring import FrameOverwritten, FrameRef, FrameRing
+
+
+def _source_frame(shape, seed):
+    import numpy as np
+
+    return np.random.default_rng(seed).integers(0, 256, size=shape, dtype=np.uint8)
+
+
+def _touch(frame):
+    """Analiză minimă care citește pixeli din tot frame-ul"""
+    return int(frame[::64, ::64].sum())
+
+
+def _producer_pickle(queue, results, camera_id, frames, shape):
+    import numpy as np
+
+    source = _source_frame(shape, hash(camera_id) % 1000)
+    buffer = np.empty(shape, dtype=np.uint8)
+    started = time.process_time()
+    for _ in range(frames):
+        np.copyto(buffer, source)  # "decodare"
+        queue.put((camera_id, time.time(), buffer))
+    results.put(("producer", time.process_time() - started, 0, 0))
+
+
+def _consumer_pickle(queue, results):
+    received = 0
+    started = time.process_time()
+    while True:
+        item = queue.get()
+        if item is None:
+            break
+        _touch(item[2])
+        received += 1
+    results.put(("consumer", time.process_time() - started, received, 0))
+
+
+def _producer_shm(queue, results, spec, camera_id, frames, shape):
+    import numpy as np
+
+    ring = FrameRing.attach(spec)
+    source = _source_frame(shape, hash(camera_id) % 1000)
+    started = time.process_time()
+    for _ in range(frames):
+        slot, view = ring.acquire(camera_id)
+        np.copyto(view, source)  # "decodare" direct în slot (ca cap.read(view))
+        generation = ring.commit(slot)
+        queue.put(FrameRef(camera_id, slot, generation, time.time(), 45.7635, 21.2456))
+    results.put(("producer", time.process_time() - started, 0, 0))
+    ring.close()
+
+
+def _consumer_shm(queue, results, spec):
+    ring = FrameRing.attach(spec)
+    received = 0
+    overwritten = 0
+    started = time.process_time()
+    while True:
+        ref = queue.get()
+        if ref is None:
+            break
+        try:
+            _touch(ring.view(ref))
+            if ring.is_current(ref):
+                received += 1
+            else:
+                overwritten += 1
+        except FrameOverwritten:
+            overwritten += 1
+    results.put(("consumer", time.process_time() - started, received, overwritten))
+    ring.close()
+
+
+def run(mode, producers, consumers, frames, shape, slots, queue_size):
+    """Rulează un mod și returnează (frame-uri/s, ms CPU per frame, frame-uri primite, suprascrieri)"""
+    queue = mp.Queue(maxsize=queue_size)
+    results = mp.Queue()
+    camera_ids = [f"cam_{i:02d}" for i in range(producers)]
+
+    ring = None
+    if mode == "shm":
+        ring = FrameRing({camera_id: shape for camera_id in camera_ids}, slots_per_camera=slots)
+        producer_args = [(queue, results, ring.spec, camera_id, frames, shape) for camera_id in camera_ids]
+        consumer_args = [(queue, results, ring.spec)] * consumers
+        producer_target, consumer_target = _producer_shm, _consumer_shm
+    else:
+        producer_args = [(queue, results, camera_id, frames, shape) for camera_id in camera_ids]
+        consumer_args = [(queue, results)] * consumers
+        producer_target, consumer_target = _producer_pickle, _consumer_pickle
+
+    consumer_processes = [mp.Process(target=consumer_target, args=args) for args in consumer_args]
+    producer_processes = [mp.Process(target=producer_target, args=args) for args in producer_args]
+    processes = consumer_processes + producer_processes
+
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+
+    # Când toate camerele au terminat, oprim procesele de analiză
+    for process in producer_processes:
+        process.join()
+    for _ in consumer_processes:
+        queue.put(None)
+
+    cpu = 0.0
+    received = 0
+    overwritten = 0
+    for _ in processes:
+        _, cpu_seconds, count, lost = results.get()
+        cpu += cpu_seconds
+        received += count
+        overwritten += lost
+    elapsed = time.perf_counter() - started
+
+    for process in consumer_processes:
+        process.join()
+    if ring is not None:
+        ring.close()
+
+    return received / elapsed, 1000 * cpu / max(received, 1), received, overwritten
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transport frame-uri între procese")
+    parser.add_argument("--producers", type=int, default=12, help="Camere simulate (procese de captură)")
+    parser.add_argument("--consumers", type=int, default=4, help="Procese de analiză")
+    parser.add_argument("--frames", type=int, default=100, help="Frame-uri per cameră")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--slots", type=int, default=8, help="Sloturi per cameră (shm)")
+    parser.add_argument("--queue-size", type=int, default=32)
+    args = parser.parse_args()
+
+    shape = (args.height, args.width, 3)
+    print(f"{args.producers} camere x {args.frames} frame-uri {args.width}x{args.height}, "
+          f"{args.consumers} procese de analiză\n")
+    print(f"{'Mod':<16}{'frame/s':>10}{'CPU ms/frame':>14}{'primite':>10}{'suprascrise':>13}")
+    for mode, label in (("pickle", "Queue (pickle)"), ("shm", "FrameRing (shm)")):
+        fps, cpu_ms, received, overwritten = run(
+            mode, args.producers, args.consumers, args.frames, shape, args.slots, args.queue_size
+        )
+        print(f"{label:<16}{fps:>10.0f}{cpu_ms:>14.2f}{received:>10}{overwritten:>13}")
+
+
+if __name__ == "__main__":
+    main()
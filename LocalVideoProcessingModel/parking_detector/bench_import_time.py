@@ -0,0 +1,121 @@
+"""
+Verificare de regresie pentru timpul de import (python -X importtime)
+
+Importă fiecare modul într-un proces nou și verifică:
+  - că nu se încarcă nicio dependență grea (OpenCV, numpy, Gemini, PIL, requests, dotenv)
+  - că timpul cumulativ de import rămâne sub buget
+
+Ieșire cu cod 1 dacă oricare verificare eșuează.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+MODULES = [
+    "parking_detector",
+    "parking_detector.parsing",
+    "parking_detector.normalization",
+    "parking_detector.dedup",
+    "parking_detector.gps",
+    "parking_detector.geocoding",
+    "parking_detector.change_gate",
+    "parking_detector.gemini_client",
+    "parking_detector.backend",
+    "parking_detector.scheduler",
+    "parking_detector.live",
+    "parking_detector.offline",
+    "parking_detector.simulate_scheduler",
+    "parking_detector.compare_prompts",
+    "parking_detector.bench_normalization",
+    "parking_detector.frame_ring",
+    "parking_detector.bench_frame_transport",
+    "parking_detector.snapshot",
+    "parking_detector.bench_capture",
+    "parking_detector.plate_ocr",
+    "parking_detector.bench_plate_ocr",
+    "parking_detector.bench_dashboard",
+    "parking_detector.pipeline",
+    "parking_detector.simulate_pipeline",
+    "test_cam_live_gemini",
+    "test_gemini",
+    "extract_frames",
+    "test1",
+    "test_gps",
+]
+
+HEAVY_MODULES = ("cv2", "numpy", "google.generativeai", "PIL", "requests", "dotenv")
+
+BUDGET_MS = 50.0
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_import(module, runs=3):
+    """
+    Importă modulul într-un proces nou de `runs` ori
+
+    Returns:
+        (cel mai mic timp cumulativ în ms, setul de module importate, eroare sau None)
+    """
+    best = None
+    imported = set()
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=PROJECT_DIR, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            return None, imported, proc.stderr.strip().splitlines()[-1]
+
+        cumulative = None
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            parts = [p.strip() for p in line[len("import time:"):].split("|")]
+            if not parts[0].isdigit():
+                continue  # linia de antet
+            name = parts[2]
+            imported.add(name.strip())
+            if name.strip() == module:
+                cumulative = int(parts[1]) / 1000.0
+        if cumulative is not None and (best is None or cumulative < best):
+            best = cumulative
+    return best, imported, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verificare timp de import")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="Timp cumulativ maxim per modul")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    failures = 0
+    print(f"{'Modul':<40}{'import (ms)':>12}  Status")
+    for module in MODULES:
+        cumulative, imported, error = measure_import(module, args.runs)
+        heavy = sorted(name for name in imported
+                       if any(name == h or name.startswith(h + ".") for h in HEAVY_MODULES))
+        heavy = sorted({name.split(".")[0] if not name.startswith("google") else name for name in heavy})
+
+        if error:
+            status = f"❌ eroare: {error}"
+        elif heavy:
+            status = f"❌ importă la încărcare: {', '.join(heavy)}"
+        elif cumulative is not None and cumulative > args.budget_ms:
+            status = f"❌ peste bugetul de {args.budget_ms:g} ms"
+        else:
+            status = "✓"
+        failures += not status.startswith("✓")
+
+        shown = f"{cumulative:.1f}" if cumulative is not None else "-"
+        print(f"{module:<40}{shown:>12}  {status}")
+
+    if failures:
+        print(f"\n❌ {failures} module au regresat")
+        sys.exit(1)
+    print("\n✓ Toate modulele se importă rapid și fără dependențe grele")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Benchmark: normalizarea descrierilor și canonicalizarea numerelor de înmatriculare
+
+Corpusul vine din răspunsurile înregistrate în gemini_usage.jsonl; dacă nu sunt
+destule, se completează cu descrieri sintetice (cu repetiții, ca în producție).
+Compară implementarea inițială (liste + `in`) cu cea bazată pe dicționar, cu și fără memoizare.
+Înainte de măsurători verifică cheile pentru descrierile din REGRESSION_CASES (cod de
+ieșire 1 dacă una diferă).
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from .gemini_client import USAGE_LOG
+from .normalization import COLOR_FORMS, canonicalize_plate, normalize_vehicle_description
+from .parsing import extract_plate_number, extract_vehicle_description
+
+
+# Descriere -> cheia așteptată; cuvintele compuse trebuie să dea aceeași cheie ca scanarea inițială
+REGRESSION_CASES = {
+    "mașină gri-argintiu": "gri",
+    "autoturism alb/negru": "alb",
+    "Volkswagen Golf hatchback-ul gri": "gri_hatchback",
+    "Dacia Logan neagră": "negru",
+    "SUV-ul roșu, parțial vizibil": "rosu_suv",
+    "taxiul galben": "galben_taxi",
+    "camionetă albă.": "alb_camioneta",
+    "cenușie berlină": "gri_sedan",
+    "Ford Focus": "ford_focus",
+}
+
+
+def check_regressions(cases=REGRESSION_CASES):
+    """Descrierile din `cases` pentru care cheia diferă: [(descriere, așteptat, obținut)]"""
+    normalize = normalize_vehicle_description.__wrapped__
+    return [(description, expected, normalize(description))
+            for description, expected in cases.items()
+            if normalize(description) != expected]
+
+
+def legacy_normalize_vehicle_description(description):
+    """Implementarea inițială (referință pentru benchmark)"""
+    if not description:
+        return "unknown"
+
+    desc = description.lower()
+
+    colors = []
+    color_keywords = ['alb', 'negru', 'gri', 'roșu', 'albastru', 'verde', 'galben', 'argintiu', 'maro', 'portocaliu']
+    for color in color_keywords:
+        if color in desc:
+            colors.append(color)
+
+    vehicle_types = []
+    type_keywords = ['taxi', 'camion', 'camioneta', 'suv', 'van', 'sedan', 'hatchback', 'coupe', 'break']
+    for vtype in type_keywords:
+        if vtype in desc:
+            vehicle_types.append(vtype)
+            break
+
+    parts = []
+    if colors:
+        parts.append(colors[0])
+    if vehicle_types:
+        parts.append(vehicle_types[0])
+
+    if not parts:
+        words = desc.split()[:3]
+        return '_'.join(words)
+
+    return '_'.join(parts)
+
+
+def load_recorded(path=USAGE_LOG):
+    """Descrierile și numerele din răspunsurile înregistrate"""
+    descriptions, plates = [], []
+    if not os.path.exists(path):
+        return descriptions, plates
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            response = json.loads(line).get("response")
+            if not response:
+                continue
+            description = extract_vehicle_description(response)
+            plate = extract_plate_number(response)
+            if description:
+                descriptions.append(description)
+            if plate:
+                plates.append(plate)
+    return descriptions, plates
+
+
+def synthetic_corpus(size, seed=42):
+    """Descrieri și numere sintetice, distribuite Zipf (puține forme foarte frecvente)"""
+    rng = random.Random(seed)
+    colors = ["neagră", "neagra", "albă", "alb", "gri", "roșie", "rosie", "albastru", "argintie",
+              "verde", "galbenă", "maro", "portocalie", "gri închis", "gri metalizat"]
+    types = ["SUV", "sedan", "hatchback", "break", "camionetă", "taxi", "van", "coupe", "camion", "autoturism"]
+    templates = ["mașină {c} {t}", "{t} {c}", "Autoturism {c}, tip {t}", "vehicul {c} ({t})",
+                 "{c} {t}, parțial vizibil", "Mașină {C} {T}"]
+    counties = ["TM", "AR", "CJ", "B", "IS", "BV"]
+
+    variants = []
+    for _ in range(2000):
+        c, t = rng.choice(colors), rng.choice(types)
+        variants.append(rng.choice(templates).format(c=c, t=t, C=c.upper(), T=t.upper()))
+    weights = [1.0 / (i + 1) for i in range(len(variants))]
+    descriptions = rng.choices(variants, weights=weights, k=size)
+
+    plates = []
+    for _ in range(size // 10):
+        county = rng.choice(counties)
+        digits = rng.randint(10, 999 if county == "B" else 99)
+        letters = "".join(rng.choice("ABCDEFGHJKLMNPRSTUVWXYZ") for _ in range(3))
+        separator = rng.choice([" ", "", "-"])
+        plate = f"{county}{separator}{digits}{separator}{letters}"
+        plates.append(plate if rng.random() < 0.7 else plate.lower())
+    return descriptions, plates
+
+
+def bench(function, items, repeat=3):
+    """Cel mai bun timp (secunde) pentru a procesa toate elementele"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            function(item)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark normalizare descrieri / numere")
+    parser.add_argument("--size", type=int, default=200_000, help="Dimensiunea minimă a corpusului")
+    parser.add_argument("--log", default=USAGE_LOG, help="Jurnalul cu răspunsurile înregistrate")
+    args = parser.parse_args()
+
+    regressions = check_regressions()
+    for description, expected, actual in regressions:
+        print(f"❌ {description!r}: așteptat {expected!r}, obținut {actual!r}")
+    if regressions:
+        sys.exit(1)
+    print(f"✓ {len(REGRESSION_CASES)} cazuri de regresie\n")
+
+    descriptions, plates = load_recorded(args.log)
+    recorded = len(descriptions)
+    if len(descriptions) < args.size:
+        extra_descriptions, extra_plates = synthetic_corpus(args.size - len(descriptions))
+        descriptions += extra_descriptions
+        plates += extra_plates
+
+    print(f"Corpus: {len(descriptions)} descrieri ({recorded} înregistrate, "
+          f"{len(set(descriptions))} distincte), {len(plates)} numere\n")
+
+    uncached = normalize_vehicle_description.__wrapped__
+    normalize_vehicle_description.cache_clear()
+    results = [
+        ("inițial (liste + in)", bench(legacy_normalize_vehicle_description, descriptions)),
+        ("dicționar, fără cache", bench(uncached, descriptions)),
+        ("dicționar + memoizare", bench(normalize_vehicle_description, descriptions)),
+    ]
+    baseline = results[0][1]
+    print(f"{'Normalizare descriere':<26}{'total (ms)':>12}{'µs/descriere':>14}{'accelerare':>12}")
+    for name, seconds in results:
+        print(f"{name:<26}{seconds * 1000:>12.1f}{seconds / len(descriptions) * 1e6:>14.2f}"
+              f"{baseline / seconds:>11.1f}x")
+    info = normalize_vehicle_description.cache_info()
+    print(f"cache: {info.hits} hit / {info.misses} miss")
+
+    legacy_keys = [legacy_normalize_vehicle_description(d) for d in descriptions]
+    new_keys = [normalize_vehicle_description(d) for d in descriptions]
+    legacy_colored = sum(k.split("_")[0] in COLOR_FORMS or k.split("_")[0] == "roșu" for k in legacy_keys)
+    new_colored = sum(k.split("_")[0] in COLOR_FORMS for k in new_keys)
+    print(f"chei distincte de descriere: inițial {len(set(legacy_keys))}, nou {len(set(new_keys))}")
+    print(f"culoare recunoscută: inițial {100 * legacy_colored / len(descriptions):.1f}%, "
+          f"nou {100 * new_colored / len(descriptions):.1f}%")
+
+    plate_time = bench(canonicalize_plate.__wrapped__, plates)
+    print(f"\nCanonicalizare numere: {plate_time / len(plates) * 1e6:.2f} µs/număr")
+    print(f"chei distincte de număr: brut {len(set(plates))}, canonic {len({canonicalize_plate(p) for p in plates})}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark: citirea locală a numerelor (plate_ocr) pe imaginile incluse
+
+- viteza pe un nucleu (cv2.setNumThreads(1)): localizare și localizare + OCR, în
+  frame-uri/s și zone de plăcuță/s
+- debitul PlateOCRPool cu N procese (JPEG-uri decodate în worker, ca în modul snapshot)
+- acordul cu modelul: numerele citite de Gemini pentru aceleași imagini se păstrează în
+  plate_reference.json (--query-model le obține o dată, necesită GEMINI_API_KEY)
+"""
+import argparse
+import json
+import os
+import time
+
+from .compare_prompts import find_images
+from .normalization import canonicalize_plate
+from .parsing import extract_plate_number
+from .plate_ocr import MIN_CONFIDENCE, PLATE_OCR_MODEL, PlateOCRPool, get_reader, locate_plates
+
+DEFAULT_PATHS = ["car_1.jpeg", "test_images", "extracted_frames"]
+REFERENCE_FILE = "plate_reference.json"
+
+
+def query_model(paths):
+    """Numărul citit de model pentru fiecare imagine (canonic sau None = necitibil)"""
+    import cv2
+
+    from .gemini_client import analyze_jpeg, configure, encode_jpeg
+
+    configure()
+    reference = {}
+    for path in paths:
+        print(f"📤 {path}...")
+        text, _ = analyze_jpeg(encode_jpeg(cv2.imread(path)))
+        reference[os.path.basename(path)] = canonicalize_plate(extract_plate_number(text)) if text else None
+    return reference
+
+
+def bench_single_core(frames, reader, repeat):
+    """(secunde localizare, secunde localizare + OCR, zone găsite) pe un singur fir"""
+    import cv2
+
+    cv2.setNumThreads(1)
+    locate_time = read_time = 0.0
+    regions = 0
+    for _ in range(repeat):
+        for frame in frames:
+            started = time.perf_counter()
+            regions += len(locate_plates(frame))
+            locate_time += time.perf_counter() - started
+            if reader is not None:
+                started = time.perf_counter()
+                reader.read(frame)
+                read_time += time.perf_counter() - started
+    return locate_time, read_time, regions
+
+
+def bench_pool(jpegs, workers, repeat, model_path):
+    """Frame-uri/s prin PlateOCRPool (decodare JPEG + localizare + OCR în worker)"""
+    pool = PlateOCRPool(workers=workers, model_path=model_path)
+    try:
+        pool.read(jpegs[0])  # pornește procesele și încarcă modelul
+        started = time.perf_counter()
+        futures = [pool.submit(jpeg) for _ in range(repeat) for jpeg in jpegs]
+        for future in futures:
+            future.result()
+        return len(futures) / (time.perf_counter() - started)
+    finally:
+        pool.close()
+
+
+def compare(local, reference):
+    """Numără cazurile de acord / dezacord între OCR-ul local și model"""
+    counts = {"același număr": 0, "ambele necitibil": 0, "doar OCR local": 0, "doar modelul": 0, "diferite": 0}
+    for name, model_plate in reference.items():
+        local_plate = local.get(name)
+        if local_plate and model_plate:
+            counts["același număr" if local_plate == model_plate else "diferite"] += 1
+        elif local_plate:
+            counts["doar OCR local"] += 1
+        elif model_plate:
+            counts["doar modelul"] += 1
+        else:
+            counts["ambele necitibil"] += 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR local pentru numere de înmatriculare")
+    parser.add_argument("paths", nargs="*", default=DEFAULT_PATHS, help="Imagini sau foldere")
+    parser.add_argument("--model", default=PLATE_OCR_MODEL, help="Modelul OCR (ONNX)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Procese PlateOCRPool")
+    parser.add_argument("--reference", default=REFERENCE_FILE, help="Numerele citite de model (JSON)")
+    parser.add_argument("--query-model", action="store_true", help="Obține referința de la Gemini")
+    args = parser.parse_args()
+
+    import cv2
+
+    paths = find_images(args.paths)
+    if not paths:
+        print("❌ Nu am găsit imagini!")
+        return
+    frames = [cv2.imread(path) for path in paths]
+    reader = get_reader(args.model)
+
+    print(f"{len(paths)} imagini x {args.repeat} repetări\n")
+    locate_time, read_time, regions = bench_single_core(frames, reader, args.repeat)
+    count = len(frames) * args.repeat
+    print(f"{'Un nucleu':<26}{'frame/s':>10}{'zone/s':>10}{'ms/frame':>10}")
+    print(f"{'localizare':<26}{count / locate_time:>10.1f}{regions / locate_time:>10.1f}"
+          f"{1000 * locate_time / count:>10.1f}")
+    if reader is None:
+        print("\nOCR dezactivat: descărcați modelul CRNN (vezi plate_ocr.py) pentru măsurarea completă")
+        return
+    print(f"{'localizare + OCR':<26}{count / read_time:>10.1f}{regions / read_time:>10.1f}"
+          f"{1000 * read_time / count:>10.1f}")
+
+    jpegs = []
+    for path in paths:
+        with open(path, "rb") as f:
+            jpegs.append(f.read())
+    rate = bench_pool(jpegs, args.workers, args.repeat, args.model)
+    print(f"PlateOCRPool ({args.workers} procese): {rate:.1f} frame/s, {rate / args.workers:.1f} frame/s per nucleu")
+
+    reference = {}
+    if args.query_model:
+        reference = query_model(paths)
+        with open(args.reference, "w", encoding="utf-8") as f:
+            json.dump(reference, f, indent=2, ensure_ascii=False)
+    elif os.path.exists(args.reference):
+        with open(args.reference, encoding="utf-8") as f:
+            reference = json.load(f)
+
+    local = {}
+    print(f"\n{'Imagine':<24}{'OCR local':>12}{'încredere':>11}{'model':>12}")
+    for path, frame in zip(paths, frames):
+        name = os.path.basename(path)
+        readings = reader.read(frame)
+        best = readings[0] if readings and readings[0].confidence >= MIN_CONFIDENCE else None
+        local[name] = best.plate if best else None
+        model_plate = reference.get(name, "-") or "necitibil"
+        print(f"{name:<24}{(best.plate if best else '-'):>12}{(best.confidence if best else 0):>11.2f}"
+              f"{model_plate:>12}")
+
+    if not reference:
+        print("\nFără referință: rulați cu --query-model pentru a compara cu modelul")
+        return
+    counts = compare(local, reference)
+    agreement = counts["același număr"] + counts["ambele necitibil"]
+    print(f"\nAcord cu modelul: {agreement}/{len(reference)} "
+          + ", ".join(f"{name} {value}" for name, value in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
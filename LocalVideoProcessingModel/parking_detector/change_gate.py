@@ -0,0 +1,47 @@
+"""
+Change gate: sare peste apelurile la model când scena nu s-a schimbat
+"""
+
+
+class ChangeGate:
+    """
+    Filtru de schimbare a scenei: trimite un frame la Gemini doar dacă diferă suficient
+    de ultimul frame analizat (sau dacă a trecut prea mult timp de la ultima analiză)
+    """
+
+    def __init__(self, threshold=0.01, pixel_delta=25, max_interval=300, size=(64, 36)):
+        self.threshold = threshold        # fracțiunea minimă de pixeli schimbați
+        self.pixel_delta = pixel_delta    # diferența minimă de intensitate pentru un pixel "schimbat"
+        self.max_interval = max_interval  # secunde după care analizăm oricum
+        self.size = size
+        self.reference = None
+        self.reference_time = None
+        self.last_score = 0.0
+
+    def _thumbnail(self, frame):
+        import cv2
+
+        # Acceptă și frame-uri deja în tonuri de gri (ex: decode_gate_frame din snapshot)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        small = cv2.resize(gray, self.size, interpolation=cv2.INTER_AREA)
+        return cv2.GaussianBlur(small, (3, 3), 0)
+
+    def score(self, frame):
+        """Returnează fracțiunea de pixeli schimbați față de frame-ul de referință (0.0 - 1.0)"""
+        import cv2
+        import numpy as np
+
+        if self.reference is None:
+            return 1.0
+        diff = cv2.absdiff(self._thumbnail(frame), self.reference)
+        return np.count_nonzero(diff > self.pixel_delta) / diff.size
+
+    def should_analyze(self, frame, now):
+        """Decide dacă frame-ul trebuie trimis la model; actualizează referința dacă da"""
+        self.last_score = self.score(frame)
+        stale = self.reference_time is None or now - self.reference_time >= self.max_interval
+        if self.last_score >= self.threshold or stale:
+            self.reference = self._thumbnail(frame)
+            self.reference_time = now
+            return True
+        return False
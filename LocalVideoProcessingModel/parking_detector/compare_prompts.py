@@ -0,0 +1,168 @@
+"""
+Compară costul și latența pe frame pentru variantele de prompt (full / compact)
+și modurile de trimitere a instrucțiunii (inline / system / cached)
+
+Folosește un model stub local (fără API key), care numără token-ii aproximativ
+ca Gemini și simulează latența în funcție de numărul de token-i. Stub-ul cache-uiește
+orice instrucțiune; rândurile `cached` pentru instrucțiuni sub MIN_CACHE_TOKENS sunt
+marcate cu `*`, pentru că API-ul real refuză cache-ul și revine la `system`.
+"""
+import argparse
+import math
+import os
+import time
+
+from .gemini_client import MIN_CACHE_TOKENS, PROMPT_MODES, PROMPT_VARIANTS, analyze_jpeg, encode_jpeg
+
+# Prețuri gemini-2.5-flash (USD / 1M token-i) - ajustează după tariful curent
+PRICE_INPUT_PER_M = 0.30
+PRICE_CACHED_PER_M = 0.075
+PRICE_OUTPUT_PER_M = 2.50
+
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png']
+
+STUB_RESPONSE = """ÎNCĂLCARE: DA
+NUMĂR_ÎNMATRICULARE: necitibil
+DESCRIERE_VEHICUL: mașină neagră SUV
+LOCAȚIE_ÎNCĂLCARE: parcată pe zona hașurată"""
+
+
+def count_text_tokens(text):
+    """Aproximare: ~3.5 caractere pe token pentru text în română"""
+    return math.ceil(len(text) / 3.5)
+
+
+def count_image_tokens(jpeg_bytes):
+    """Gemini: 258 token-i pentru imagini <= 384px, altfel 258 pe fiecare tile de 768x768"""
+    import cv2
+    import numpy as np
+
+    image = cv2.imdecode(np.frombuffer(jpeg_bytes, np.uint8), cv2.IMREAD_GRAYSCALE)
+    height, width = image.shape[:2]
+    if width <= 384 and height <= 384:
+        return 258
+    return 258 * math.ceil(width / 768) * math.ceil(height / 768)
+
+
+class StubUsage:
+    def __init__(self, prompt_tokens, cached_tokens, response_tokens):
+        self.prompt_token_count = prompt_tokens
+        self.cached_content_token_count = cached_tokens
+        self.candidates_token_count = response_tokens
+        self.total_token_count = prompt_tokens + response_tokens
+
+
+class StubResponse:
+    def __init__(self, text, usage_metadata):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class StubModel:
+    """
+    Înlocuitor local pentru GenerativeModel
+
+    Latența simulată = overhead fix + cost pe token de intrare (necache-uit) + cost pe token generat
+    """
+
+    def __init__(self, system_instruction=None, cached=False, base_latency=0.3,
+                 input_token_latency=0.00005, cached_token_latency=0.00001, output_token_latency=0.005):
+        self.system_instruction = system_instruction
+        self.cached = cached
+        self.base_latency = base_latency
+        self.input_token_latency = input_token_latency
+        self.cached_token_latency = cached_token_latency
+        self.output_token_latency = output_token_latency
+
+    def generate_content(self, contents):
+        prompt_tokens = 0
+        for part in contents:
+            if isinstance(part, str):
+                prompt_tokens += count_text_tokens(part)
+            else:
+                prompt_tokens += count_image_tokens(part["data"])
+
+        cached_tokens = 0
+        if self.system_instruction:
+            instruction_tokens = count_text_tokens(self.system_instruction)
+            prompt_tokens += instruction_tokens
+            if self.cached:
+                cached_tokens = instruction_tokens
+
+        response_tokens = count_text_tokens(STUB_RESPONSE)
+        time.sleep(self.base_latency
+                   + (prompt_tokens - cached_tokens) * self.input_token_latency
+                   + cached_tokens * self.cached_token_latency
+                   + response_tokens * self.output_token_latency)
+        return StubResponse(STUB_RESPONSE, StubUsage(prompt_tokens, cached_tokens, response_tokens))
+
+
+def cost_usd(usage):
+    """Costul estimat al unei cereri"""
+    uncached = usage["prompt_tokens"] - usage["cached_tokens"]
+    return (uncached * PRICE_INPUT_PER_M
+            + usage["cached_tokens"] * PRICE_CACHED_PER_M
+            + usage["response_tokens"] * PRICE_OUTPUT_PER_M) / 1_000_000
+
+
+def find_images(paths):
+    images = []
+    for path in paths:
+        if os.path.isdir(path):
+            images.extend(os.path.join(path, f) for f in sorted(os.listdir(path))
+                          if any(f.lower().endswith(ext) for ext in IMAGE_EXTENSIONS))
+        elif os.path.exists(path):
+            images.append(path)
+    return images
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost și latență pe frame pentru variantele de prompt")
+    parser.add_argument("images", nargs="*", default=["test_images", "extracted_frames", "car_1.jpeg"],
+                        help="Imagini sau foldere (implicit: test_images/, extracted_frames/, car_1.jpeg)")
+    args = parser.parse_args()
+
+    import cv2
+
+    images = find_images(args.images)
+    if not images:
+        print("❌ Nu am găsit imagini! Rulează mai întâi extract_frames.py")
+        return
+
+    # Imaginile se codează o singură dată, la fel ca în pipeline (JPEG din frame-ul BGR)
+    frames = [encode_jpeg(cv2.imread(path)) for path in images]
+    print(f"{len(frames)} imagini, {sum(len(f) for f in frames) / len(frames) / 1024:.0f} KB/imagine în medie\n")
+
+    print(f"{'Variantă':<10}{'Mod':<8}{'prompt':>8}{'cache':>8}{'răspuns':>9}"
+          f"{'octeți text':>13}{'USD/1000 fr.':>14}{'latență':>10}")
+    too_short = {}
+    for variant, instruction in PROMPT_VARIANTS.items():
+        for mode in PROMPT_MODES:
+            label = mode
+            if mode == "cached" and count_text_tokens(instruction) < MIN_CACHE_TOKENS:
+                too_short[variant] = count_text_tokens(instruction)
+                label = "cached*"
+            model = StubModel(
+                system_instruction=instruction if mode != "inline" else None,
+                cached=mode == "cached",
+            )
+            usages = [analyze_jpeg(jpeg, model=model, variant=variant, mode=mode)[1] for jpeg in frames]
+
+            n = len(usages)
+            print(f"{variant:<10}{label:<8}"
+                  f"{sum(u['prompt_tokens'] for u in usages) / n:>8.0f}"
+                  f"{sum(u['cached_tokens'] for u in usages) / n:>8.0f}"
+                  f"{sum(u['response_tokens'] for u in usages) / n:>9.0f}"
+                  f"{sum(u['prompt_bytes'] for u in usages) / n:>13.0f}"
+                  f"{1000 * sum(cost_usd(u) for u in usages) / n:>14.4f}"
+                  f"{sum(u['latency'] for u in usages) / n * 1000:>8.0f}ms")
+
+    if too_short:
+        print("\n* Nerealizabil cu promptul curent: instrucțiunea are "
+              + ", ".join(f"~{tokens} token-i ({variant})" for variant, tokens in too_short.items())
+              + f", sub minimul de {MIN_CACHE_TOKENS} pentru context cache. API-ul refuză cache-ul și "
+              "cererile se trimit ca în modul system (economia de mai sus e doar a stub-ului).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Evidența vehiculelor deja raportate (deduplicare după număr sau locație+descriere)
+"""
+import time
+
+REPORT_COOLDOWN = 1800  # 30 minute în secunde
+LOCATION_TOLERANCE = 0.002  # ~200 metri - verifică dacă există rapoarte în apropiere
+SIGHTING_TOLERANCE = 0.0001  # ~10 metri - aceeași cameră
+SIGHTING_MIN_IOU = 0.5       # suprapunerea minimă a plăcuței față de raportul anterior
+
+# Dicționar pentru a ține evidența mașinilor deja raportate
+reported_vehicles = {}  # {vehicle_id: timestamp} - poate fi plate_number SAU location+description
+
+# Unde a fost văzut numărul raportat (OCR local): {număr: (lat, lon, colțurile plăcuței în frame)}
+plate_sightings = {}
+
+
+def _box_iou(box_a, box_b):
+    """Suprapunerea (IoU) dreptunghiurilor care încadrează două plăcuțe (colțuri [[x, y], ...])"""
+    ax = [x for x, _ in box_a]
+    ay = [y for _, y in box_a]
+    bx = [x for x, _ in box_b]
+    by = [y for _, y in box_b]
+    width = min(max(ax), max(bx)) - max(min(ax), min(bx))
+    height = min(max(ay), max(by)) - max(min(ay), min(by))
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    area_a = (max(ax) - min(ax)) * (max(ay) - min(ay))
+    area_b = (max(bx) - min(bx)) * (max(by) - min(by))
+    return intersection / (area_a + area_b - intersection)
+
+
+def remember_plate_sighting(plate, lat, lon, box, sightings=None, reported=None):
+    """Reține locația și poziția plăcuței pentru un număr tocmai raportat"""
+    if sightings is None:
+        sightings = plate_sightings
+    if reported is None:
+        reported = reported_vehicles
+    # Numerele care au ieșit din evidență nu mai au nevoie de poziție
+    for stale in [stale for stale in sightings if stale not in reported]:
+        del sightings[stale]
+    sightings[plate] = (lat, lon, box)
+
+
+def is_same_sighting(plate, lat, lon, box, sightings=None):
+    """Numărul e văzut în același loc (aceeași cameră, aceeași poziție a plăcuței) ca la raportare?"""
+    if sightings is None:
+        sightings = plate_sightings
+    if plate not in sightings or lat is None or lon is None or box is None:
+        return False
+    reported_lat, reported_lon, reported_box = sightings[plate]
+    if reported_lat is None or reported_lon is None:
+        return False
+    return (abs(lat - reported_lat) < SIGHTING_TOLERANCE and abs(lon - reported_lon) < SIGHTING_TOLERANCE
+            and _box_iou(box, reported_box) >= SIGHTING_MIN_IOU)
+
+
+# Funcție pentru a verifica dacă o mașină a fost deja raportată recent
+def is_vehicle_recently_reported(vehicle_id, identifier_type="unknown", lat=None, lon=None, color=None,
+                                 now=None, reported=None):
+    """
+    Verifică dacă vehiculul a fost raportat recent (fie după număr, fie după locație+descriere)
+
+    Args:
+        now: Momentul curent în secunde (implicit time.time(); offline se folosește timpul din video)
+        reported: Dicționarul de vehicule raportate (implicit cel global)
+    """
+    if not vehicle_id:
+        return False
+
+    if reported is None:
+        reported = reported_vehicles
+    current_time = time.time() if now is None else now
+
+    # Curăță dicționarul de intrări vechi
+    expired_vehicles = [vid for vid, timestamp in reported.items()
+                       if current_time - timestamp > REPORT_COOLDOWN]
+    for vid in expired_vehicles:
+        del reported[vid]
+
+    # Verifică exact match
+    if vehicle_id in reported:
+        time_since_report = current_time - reported[vehicle_id]
+        print(f"⏳ Vehicul ({identifier_type}) deja raportat acum {int(time_since_report/60)} minute [EXACT MATCH]")
+        return True
+
+    # Verifică și vehicule similare în apropiere (doar pentru identificări bazate pe locație)
+    if lat and lon and color and '_' not in str(vehicle_id)[:10]:  # Nu este plate number
+        for reported_id in list(reported.keys()):
+            if current_time - reported[reported_id] > REPORT_COOLDOWN:
+                continue
+
+            # Verifică dacă este un ID bazat pe locație
+            if reported_id.count('_') >= 2:
+                try:
+                    # Extrage coordonatele și descrierea din ID-ul raportat
+                    parts = reported_id.split('_')
+                    reported_lat = float(parts[0])
+                    reported_lon = float(parts[1])
+                    reported_desc = '_'.join(parts[2:])
+
+                    # Calculează distanța aproximativă
+                    lat_diff = abs(lat - reported_lat)
+                    lon_diff = abs(lon - reported_lon)
+
+                    # Verifică dacă este în apropiere și are aceeași culoare
+                    if lat_diff < LOCATION_TOLERANCE and lon_diff < LOCATION_TOLERANCE:
+                        if color and color in reported_desc:
+                            time_since_report = current_time - reported[reported_id]
+                            print(f"⏳ Vehicul similar în apropiere ({reported_desc}) raportat acum {int(time_since_report/60)} minute [SIMILAR MATCH]")
+                            return True
+                except:
+                    pass
+
+    return False
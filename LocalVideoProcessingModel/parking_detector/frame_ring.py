@@ -0,0 +1,158 @@
+"""
+Transport de frame-uri fără copiere între procesele de captură și cele de analiză
+
+Un singur bloc multiprocessing.shared_memory conține, pentru fiecare cameră, un număr
+fix de sloturi de dimensiunea unui frame. Procesele de captură scriu frame-ul direct
+în slot (ex: cap.read(view)), iar prin Queue circulă doar un FrameRef mic (cameră,
+slot, generație, momentul capturii, GPS).
+
+Fiecare slot are un contor de generație (protocol seqlock): impar cât timp se scrie,
+par după commit. Cititorul compară generația din FrameRef cu cea curentă înainte și
+după ce folosește pixelii, ca să detecteze frame-urile suprascrise între timp.
+"""
+from collections import namedtuple
+
+FrameRef = namedtuple("FrameRef", "camera_id slot generation capture_time latitude longitude")
+
+_ALIGNMENT = 64
+
+
+class FrameOverwritten(Exception):
+    """Slotul a fost rescris de captură înainte ca analiza să termine de citit frame-ul"""
+
+
+def _align(offset):
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class FrameRing:
+    """
+    Buffer circular de frame-uri în memorie partajată
+
+    Args:
+        cameras: {camera_id: (înălțime, lățime, canale)} - dimensiunea fixă a frame-urilor
+        slots_per_camera: Câte frame-uri păstrăm pentru fiecare cameră
+        name: Numele blocului de memorie partajată (pentru attach)
+        create: True în procesul care deține bufferul, False în cele care se atașează
+    """
+
+    def __init__(self, cameras, slots_per_camera=4, name=None, create=True):
+        import numpy as np
+
+        self.cameras = [(camera_id, tuple(shape)) for camera_id, shape in dict(cameras).items()]
+        self.slots_per_camera = slots_per_camera
+        total_slots = len(self.cameras) * slots_per_camera
+
+        # Layout: [generații int64 x total_slots][slot 0][slot 1]...
+        offsets = []
+        offset = _align(total_slots * 8)
+        for _, shape in self.cameras:
+            frame_bytes = int(np.prod(shape))
+            for _ in range(slots_per_camera):
+                offsets.append(offset)
+                offset = _align(offset + frame_bytes)
+
+        self._shm = _open_shared_memory(name, create, offset)
+        self._owner = create
+
+        self._generations = np.ndarray((total_slots,), dtype=np.int64, buffer=self._shm.buf)
+        if create:
+            self._generations[:] = 0
+
+        self._views = []
+        self._slot_base = {}
+        self._next_slot = {}
+        for index, (camera_id, shape) in enumerate(self.cameras):
+            self._slot_base[camera_id] = index * slots_per_camera
+            self._next_slot[camera_id] = 0
+            for slot in range(slots_per_camera):
+                self._views.append(np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf,
+                                              offset=offsets[index * slots_per_camera + slot]))
+
+    @property
+    def spec(self):
+        """Descriere picklable, trimisă proceselor care apelează FrameRing.attach"""
+        return {
+            "name": self._shm.name,
+            "cameras": dict(self.cameras),
+            "slots_per_camera": self.slots_per_camera,
+        }
+
+    @classmethod
+    def attach(cls, spec):
+        """Se atașează la un buffer creat de alt proces"""
+        return cls(spec["cameras"], spec["slots_per_camera"], name=spec["name"], create=False)
+
+    def acquire(self, camera_id):
+        """
+        Rezervă următorul slot al camerei pentru scriere
+
+        Returns:
+            (slot, view numpy în care captura scrie frame-ul)
+        """
+        slot = self._slot_base[camera_id] + self._next_slot[camera_id]
+        self._next_slot[camera_id] = (self._next_slot[camera_id] + 1) % self.slots_per_camera
+        self._generations[slot] += 1  # impar: scriere în curs
+        return slot, self._views[slot]
+
+    def commit(self, slot):
+        """Marchează slotul ca scris complet; returnează generația de pus în FrameRef"""
+        self._generations[slot] += 1
+        return int(self._generations[slot])
+
+    def write(self, camera_id, frame):
+        """Copiază un frame existent într-un slot (când captura nu poate scrie direct în view)"""
+        slot, view = self.acquire(camera_id)
+        if frame.shape != view.shape:
+            self.commit(slot)
+            raise ValueError(f"Frame {frame.shape} diferit de slotul camerei {camera_id} {view.shape}")
+        view[...] = frame
+        return slot, self.commit(slot)
+
+    def is_current(self, ref):
+        """True dacă slotul conține încă frame-ul din FrameRef"""
+        return int(self._generations[ref.slot]) == ref.generation
+
+    def view(self, ref):
+        """
+        Frame-ul din FrameRef, fără copiere
+
+        Apelantul trebuie să verifice is_current(ref) după ce a terminat de folosit pixelii.
+        """
+        if not self.is_current(ref):
+            raise FrameOverwritten(f"Slotul {ref.slot} ({ref.camera_id}) a fost suprascris")
+        return self._views[ref.slot]
+
+    def read(self, ref):
+        """Copie validată a frame-ului din FrameRef"""
+        frame = self.view(ref).copy()
+        if not self.is_current(ref):
+            raise FrameOverwritten(f"Slotul {ref.slot} ({ref.camera_id}) a fost suprascris în timpul copierii")
+        return frame
+
+    def close(self):
+        """Eliberează view-urile și memoria (o și șterge în procesul care a creat-o)"""
+        self._views = []
+        self._generations = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+def _open_shared_memory(name, create, size):
+    import multiprocessing
+    from multiprocessing import shared_memory
+
+    if create:
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+    try:
+        # Python 3.13+: procesele atașate nu trebuie să șteargă blocul la ieșire
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        # Procesele pornite cu multiprocessing împart resource_tracker-ul cu proprietarul;
+        # doar un proces independent are propriul tracker, care ar șterge blocul la ieșire
+        if multiprocessing.parent_process() is None:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
@@ -0,0 +1,225 @@
+"""
+Client Gemini: variante de prompt, instrucțiunea statică ca prefix reutilizabil
+și contabilizarea token-ilor / octeților pentru fiecare cerere
+"""
+import json
+import os
+import time
+from datetime import datetime
+
+MODEL_NAME = "gemini-2.5-flash"
+
+# Prompt pentru parcări ilegale
+PROMPT = """
+Analizează această imagine de parcare.
+
+Identifică orice vehicul care este parcat în afara unui loc marcat sau pe o zonă interzisă/hașurată.
+
+REGULI STRICTE pentru numărul de înmatriculare:
+1. Scrie numărul DOAR dacă este COMPLET VIZIBIL și poți citi TOATE caracterele CU CERTITUDINE ABSOLUTĂ (100%)
+2. Dacă numărul este parțial vizibil, blur, în unghi, la distanță, în umbră, sau ai CEL MAI MIC DUBIU, scrie "necitibil"
+3. NU ghici, NU completa, NU deduce caractere care nu sunt perfect clare
+4. Este MULT MAI BUN să spui "necitibil" decât să dai un număr greșit
+5. Pentru a fi valid, TOATE caracterele trebuie clare, în focus, și fără nicio îndoială
+
+Dacă detectezi o încălcare, răspunde:
+ÎNCĂLCARE: DA
+NUMĂR_ÎNMATRICULARE: [număr exact SAU "necitibil"]
+DESCRIERE_VEHICUL: [culoare și tip]
+LOCAȚIE_ÎNCĂLCARE: [locație]
+
+Dacă nu există încălcare:
+ÎNCĂLCARE: NU
+"""
+
+# Aceleași reguli și același format de răspuns, cu mai puțini token-i
+COMPACT_PROMPT = """Vehicul parcat în afara locului marcat sau pe zonă interzisă/hașurată?
+Număr: doar dacă TOATE caracterele sunt 100% clare, altfel "necitibil". Nu ghici.
+Răspuns DA:
+ÎNCĂLCARE: DA
+NUMĂR_ÎNMATRICULARE: [număr sau "necitibil"]
+DESCRIERE_VEHICUL: [culoare și tip]
+LOCAȚIE_ÎNCĂLCARE: [locație]
+Răspuns NU:
+ÎNCĂLCARE: NU
+"""
+
+PROMPT_VARIANTS = {
+    "full": PROMPT,
+    "compact": COMPACT_PROMPT,
+}
+
+# Cum trimitem instrucțiunea statică:
+#   inline - text în fiecare cerere (comportamentul inițial)
+#   system - system_instruction pe model, cererea conține doar imaginea
+#   cached - context cache (CachedContent); dacă SDK-ul/modelul refuză, revine la system
+PROMPT_MODES = ("inline", "system", "cached")
+
+# Valorile din mediu; cele din .env se citesc în configure(), după load_dotenv()
+PROMPT_VARIANT = os.getenv("GEMINI_PROMPT_VARIANT", "full")
+PROMPT_MODE = os.getenv("GEMINI_PROMPT_MODE", "inline")
+CACHE_TTL_SECONDS = 3600
+# Minimul de token-i acceptat de API pentru un context cache (gemini-2.5-flash); instrucțiunile
+# mai scurte nu pot fi cache-uite și modul cached revine la system
+MIN_CACHE_TOKENS = 1024
+JPEG_QUALITY = 90
+
+USAGE_LOG = "gemini_usage.jsonl"
+
+_models = {}
+_cache_uploads = set()  # (variant, mode) al căror context cache a fost creat, dar încă necontabilizat
+
+
+def create_model(variant=None, mode=None):
+    """
+    Creează (o singură dată pe proces) modelul pentru varianta și modul de prompt date
+
+    Returns:
+        (model, mode efectiv folosit)
+    """
+    variant = variant or PROMPT_VARIANT
+    mode = mode or PROMPT_MODE
+    key = (variant, mode)
+    if key in _models:
+        return _models[key]
+
+    import google.generativeai as genai
+
+    instruction = PROMPT_VARIANTS[variant]
+    if mode == "cached":
+        try:
+            cache = genai.caching.CachedContent.create(
+                model=MODEL_NAME,
+                system_instruction=instruction,
+                ttl=CACHE_TTL_SECONDS,
+            )
+            _models[key] = (genai.GenerativeModel.from_cached_content(cache), "cached")
+            _cache_uploads.add(key)
+            return _models[key]
+        except Exception as e:
+            # Ex: promptul este sub numărul minim de token-i pentru context caching
+            print(f"⚠️ Context cache indisponibil ({e}) - se folosește system_instruction")
+            mode = "system"
+
+    if mode == "system":
+        model = genai.GenerativeModel(MODEL_NAME, system_instruction=instruction)
+    else:
+        model = genai.GenerativeModel(MODEL_NAME)
+    _models[key] = (model, mode)
+    return _models[key]
+
+
+def encode_jpeg(frame, quality=JPEG_QUALITY):
+    """Codează frame-ul OpenCV (BGR) ca JPEG"""
+    import cv2
+
+    ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("Nu am putut coda frame-ul ca JPEG")
+    return buffer.tobytes()
+
+
+def build_contents(jpeg_bytes, variant, mode):
+    """Conținutul cererii: imaginea + instrucțiunea doar în modul inline"""
+    image_part = {"mime_type": "image/jpeg", "data": jpeg_bytes}
+    if mode == "inline":
+        return [PROMPT_VARIANTS[variant], image_part]
+    return [image_part]
+
+
+def usage_from_response(response):
+    """Extrage numărul de token-i din usage_metadata (0 dacă lipsește)"""
+    metadata = getattr(response, "usage_metadata", None)
+    return {
+        "prompt_tokens": getattr(metadata, "prompt_token_count", 0) or 0,
+        "cached_tokens": getattr(metadata, "cached_content_token_count", 0) or 0,
+        "response_tokens": getattr(metadata, "candidates_token_count", 0) or 0,
+        "total_tokens": getattr(metadata, "total_token_count", 0) or 0,
+    }
+
+
+def analyze_jpeg(jpeg_bytes, model=None, variant=None, mode=None):
+    """
+    Trimite un JPEG la model
+
+    Returns:
+        (textul răspunsului sau None, dict cu contabilizarea cererii)
+    """
+    variant = variant or PROMPT_VARIANT
+    if model is None:
+        key = (variant, mode or PROMPT_MODE)
+        model, mode = create_model(variant, mode)
+    else:
+        key = None
+        mode = mode or PROMPT_MODE
+
+    contents = build_contents(jpeg_bytes, variant, mode)
+
+    started = time.perf_counter()
+    response = model.generate_content(contents)
+    latency = time.perf_counter() - started
+
+    text = response.text if response else None
+    usage = {
+        "variant": variant,
+        "mode": mode,
+        "prompt_bytes": instruction_bytes(variant, mode, key),
+        "image_bytes": len(jpeg_bytes),
+        "response_bytes": len(text.encode("utf-8")) if text else 0,
+        "latency": round(latency, 3),
+    }
+    usage.update(usage_from_response(response))
+    return text, usage
+
+
+def instruction_bytes(variant, mode, key=None):
+    """
+    Octeții instrucțiunii trimiși pe fir de o cerere
+
+    inline și system trimit textul în fiecare cerere (system_instruction face parte din
+    generate_content); cached îl trimite o singură dată, la crearea cache-ului - se
+    contabilizează la prima cerere după creare, doar dacă cache-ul chiar a fost creat.
+    """
+    size = len(PROMPT_VARIANTS[variant].encode("utf-8"))
+    if mode in ("inline", "system"):
+        return size
+    if key in _cache_uploads:
+        _cache_uploads.discard(key)
+        return size
+    return 0
+
+
+def send_to_gemini(frame):
+    """
+    Trimite frame-ul direct la Gemini
+
+    Returns:
+        (textul răspunsului, dict cu token-ii / octeții cererii)
+    """
+    print("\n📤 Se trimite frame-ul către Gemini...")
+    return analyze_jpeg(encode_jpeg(frame))
+
+
+def configure(api_key=None):
+    """Încarcă .env și configurează SDK-ul Gemini"""
+    global PROMPT_VARIANT, PROMPT_MODE
+    import google.generativeai as genai
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    PROMPT_VARIANT = os.getenv("GEMINI_PROMPT_VARIANT", PROMPT_VARIANT)
+    PROMPT_MODE = os.getenv("GEMINI_PROMPT_MODE", PROMPT_MODE)
+    if PROMPT_VARIANT not in PROMPT_VARIANTS or PROMPT_MODE not in PROMPT_MODES:
+        raise ValueError(f"GEMINI_PROMPT_VARIANT={PROMPT_VARIANT!r} / GEMINI_PROMPT_MODE={PROMPT_MODE!r} invalide "
+                         f"(variante: {', '.join(PROMPT_VARIANTS)}; moduri: {', '.join(PROMPT_MODES)})")
+    genai.configure(api_key=api_key or os.getenv("GEMINI_API_KEY"))
+
+
+def log_usage(usage, verdict, path=USAGE_LOG, **extra):
+    """Adaugă contabilizarea cererii împreună cu verdictul în jurnalul JSONL"""
+    record = {"time": datetime.now().isoformat(), "verdict": verdict, **usage, **extra}
+    try:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"❌ Nu pot scrie jurnalul de utilizare: {e}")
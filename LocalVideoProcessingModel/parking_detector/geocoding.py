@@ -0,0 +1,36 @@
+"""
+Reverse geocoding (Nominatim / OpenStreetMap)
+"""
+
+UNKNOWN_ADDRESS = ("Adresă necunoscută", "District necunoscut")
+
+
+# Funcție pentru reverse geocoding
+def get_address_from_coords(lat, lon):
+    """Obține adresa și districtul din coordonatele GPS folosind Nominatim (OpenStreetMap)"""
+    import requests
+
+    try:
+        url = f"https://nominatim.openstreetmap.org/reverse?format=json&lat={lat}&lon={lon}&zoom=18&addressdetails=1"
+        headers = {'User-Agent': 'ParkingIncidentApp/1.0'}
+        response = requests.get(url, headers=headers, timeout=5)
+
+        if response.status_code == 200:
+            data = response.json()
+            address_parts = data.get('address', {})
+
+            # Construiește adresa
+            road = address_parts.get('road', '')
+            house_number = address_parts.get('house_number', '')
+            suburb = address_parts.get('suburb', address_parts.get('neighbourhood', ''))
+            district = address_parts.get('city_district', suburb)
+
+            street = f"{road} {house_number}" if house_number else road
+
+            return street or UNKNOWN_ADDRESS[0], district or UNKNOWN_ADDRESS[1]
+        else:
+            print(f"❌ Eroare geocoding: {response.status_code}")
+            return UNKNOWN_ADDRESS
+    except Exception as e:
+        print(f"❌ Eroare la reverse geocoding: {e}")
+        return UNKNOWN_ADDRESS
@@ -0,0 +1,19 @@
+"""
+Coordonatele GPS ale camerei
+"""
+
+
+# Citire coordonate GPS din fișier
+def read_gps_coords(path="gps_coords.txt"):
+    """Citeste coordonatele GPS din fisierul gps_coords.txt"""
+    try:
+        with open(path, "r") as f:
+            gps_data = {}
+            for line in f:
+                if "=" in line:
+                    key, value = line.strip().split("=")
+                    gps_data[key.strip()] = float(value.strip())
+            return gps_data.get("lat"), gps_data.get("lon")
+    except Exception as e:
+        print(f"❌ Eroare la citirea GPS: {e}")
+        return None, None
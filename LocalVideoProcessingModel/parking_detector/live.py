@@ -0,0 +1,124 @@
+"""
+Procesare live a stream-ului de la camera telefonului (IP Webcam)
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+
+from . import snapshot
+from .gemini_client import configure
+from .gps import read_gps_coords
+from .pipeline import LivePipeline
+from .plate_ocr import PlateOCRPool
+from .scheduler import AdaptiveScheduler
+
+# URL camera telefon IP Webcam
+CAMERA_URL = "http://10.133.72.247:8080/video"
+CAMERA_ID = "telefon"
+MODEL_CALLS_PER_MINUTE = 12
+RECONNECT_DELAY = 2
+
+
+class StreamReader:
+    """Citește frame-uri din stream-ul IP Webcam; la pierderea conexiunii îl redeschide"""
+
+    def __init__(self, url, cap):
+        self.url = url
+        self.cap = cap
+
+    def read(self):
+        import cv2
+
+        ret, frame = self.cap.read()
+        if ret:
+            return frame
+        print(f"❌ Conexiune pierdută cu camera! Reconectare în {RECONNECT_DELAY}s...")
+        self.cap.release()
+        time.sleep(RECONNECT_DELAY)
+        self.cap = cv2.VideoCapture(self.url)
+        return None
+
+    def release(self):
+        self.cap.release()
+
+
+def run(url=CAMERA_URL, camera_id=CAMERA_ID, calls_per_minute=MODEL_CALLS_PER_MINUTE, plate_ocr=False,
+        priority=1.0):
+    """
+    Procesare live pentru o cameră prin LivePipeline (plate_ocr: citire locală a numerelor înainte de model)
+
+    priority > 1 (zonă fierbinte) scurtează intervalul de analiză al camerei.
+
+    Captura, filtrarea, modelul, geocodarea și trimiterea rulează pe etape separate, deci un
+    model sau un backend lent / căzut nu mai blochează captura și nu oprește procesul.
+    """
+    import cv2
+
+    cap = cv2.VideoCapture(url)
+
+    if not cap.isOpened():
+        print("❌ Nu mă pot conecta la camera telefonului!")
+        return False
+
+    print("✓ Conectat la camera telefonului.")
+
+    latitude, longitude = read_gps_coords()
+    if latitude and longitude:
+        print(f"✓ Coordonate GPS: {latitude}, {longitude}")
+    else:
+        print("❌ Nu s-au putut citi coordonatele GPS")
+
+    # Intervalul de analiză se adaptează la activitatea scenei, în limita bugetului de apeluri
+    scheduler = AdaptiveScheduler(calls_per_minute=calls_per_minute, clock=datetime.fromtimestamp)
+
+    # Numerele citite local evită apelurile la model pentru vehicule deja raportate
+    plate_pool = PlateOCRPool() if plate_ocr else None
+
+    # Change gate (pe cameră), circuitele și controlerul de încărcare sunt în pipeline
+    pipeline = LivePipeline(scheduler, plate_pool=plate_pool)
+    reader = StreamReader(url, cap)
+    pipeline.add_camera(camera_id, reader.read, latitude, longitude, priority)
+
+    print("📡 Procesare video live... (Ctrl+C pentru ieșire)")
+
+    try:
+        pipeline.run()
+    except KeyboardInterrupt:
+        print("\n✓ Procesare oprită")
+    finally:
+        reader.release()
+        if plate_pool is not None:
+            plate_pool.close()
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detecție live a parcărilor ilegale")
+    parser.add_argument("--url", default=CAMERA_URL, help="URL-ul stream-ului video IP Webcam")
+    parser.add_argument("--camera-id", default=CAMERA_ID)
+    parser.add_argument("--calls-per-minute", type=float, default=MODEL_CALLS_PER_MINUTE,
+                        help="Bugetul de apeluri la model pe minut")
+    parser.add_argument("--plate-ocr", action="store_true",
+                        help="Citire locală a numerelor (necesită modelul OCR, vezi plate_ocr.py)")
+    parser.add_argument("--capture", choices=("stream", "snapshot"), default="stream",
+                        help="stream: decodare continuă /video; snapshot: /shot.jpg doar la analiză")
+    parser.add_argument("--priority", action="append", default=[], type=snapshot.parse_priority,
+                        help="Prioritatea camerei ca id=factor, ex. telefon=2 pentru o zonă fierbinte")
+    args = parser.parse_args()
+
+    priorities = dict(args.priority)
+    snapshot.check_priorities(parser, priorities, [args.camera_id])
+
+    configure()
+    if args.capture == "snapshot":
+        ok = snapshot.run({args.camera_id: args.url}, args.calls_per_minute, args.plate_ocr, priorities)
+    else:
+        ok = run(args.url, args.camera_id, args.calls_per_minute, plate_ocr=args.plate_ocr,
+                 priority=priorities.get(args.camera_id, 1.0))
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
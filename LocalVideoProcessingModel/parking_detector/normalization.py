@@ -0,0 +1,194 @@
+"""
+Normalizarea descrierii vehiculului și canonicalizarea numerelor de înmatriculare
+
+Culorile și tipurile (cu formele de gen/număr din română) se recunosc printr-o singură
+căutare pe cuvânt într-un dicționar precompilat care conține și grafiile cu diacritice,
+deci textul nu mai trebuie transformat înainte (eliminarea diacriticelor rămâne doar
+pentru cazurile rare fără potrivire). Rezultatele se memorează, pentru că modelul
+repetă des aceleași descrieri.
+"""
+import itertools
+import re
+import unicodedata
+from functools import lru_cache
+
+# Diacriticele românești (inclusiv variantele cu sedilă) + fallback NFKD pentru restul
+_DIACRITICS = (("ă", "a"), ("â", "a"), ("î", "i"), ("ș", "s"), ("ş", "s"), ("ț", "t"), ("ţ", "t"),
+               ("Ă", "A"), ("Â", "A"), ("Î", "I"), ("Ș", "S"), ("Ş", "S"), ("Ț", "T"), ("Ţ", "T"))
+
+# Forma canonică -> formele întâlnite în descrieri (fără diacritice)
+COLOR_FORMS = {
+    "alb": ("alb", "alba", "albe", "albi"),
+    "negru": ("negru", "neagra", "negre", "negri"),
+    "gri": ("gri", "cenusiu", "cenusie"),
+    "rosu": ("rosu", "rosie", "rosii", "visiniu", "visinie"),
+    "albastru": ("albastru", "albastra", "albastre", "albastri", "bleumarin"),
+    "verde": ("verde", "verzi"),
+    "galben": ("galben", "galbena", "galbene", "galbeni"),
+    "argintiu": ("argintiu", "argintie", "argintii", "argintiul"),
+    "maro": ("maro",),
+    "portocaliu": ("portocaliu", "portocalie", "portocalii"),
+}
+
+# Ordinea contează: primul tip din listă are prioritate (taxi înaintea oricărui alt tip)
+TYPE_FORMS = {
+    "taxi": ("taxi", "taxiul"),
+    "camion": ("camion", "camionul", "tir"),
+    "camioneta": ("camioneta", "camionetei", "duba", "dubita", "utilitara"),
+    "suv": ("suv", "suvul"),
+    "van": ("van", "minivan", "monovolum"),
+    "sedan": ("sedan", "berlina"),
+    "hatchback": ("hatchback", "hatch"),
+    "coupe": ("coupe", "cupe"),
+    "break": ("break", "combi", "kombi"),
+}
+
+# Literele care pot apărea cu diacritice (inclusiv variantele cu sedilă)
+_ACCENTED = {"a": "aăâ", "i": "iî", "s": "sșş", "t": "tțţ"}
+
+
+def _spellings(form):
+    """Toate grafiile unei forme cu/fără diacritice: "neagra" -> "neagra", "neagră", "neăgra", ..."""
+    return ("".join(letters) for letters in itertools.product(*(_ACCENTED.get(c, c) for c in form)))
+
+
+_KEYWORDS = {}
+for _canonical, _forms in COLOR_FORMS.items():
+    for _form in _forms:
+        _KEYWORDS[_form] = ("color", _canonical)
+for _priority, (_canonical, _forms) in enumerate(TYPE_FORMS.items()):
+    for _form in _forms:
+        _KEYWORDS[_form] = ("type", _canonical, _priority)
+
+# Aceleași intrări sub toate grafiile cu diacritice (~1500 de chei), ca descrierea să nu
+# mai treacă prin fold_diacritics înainte de căutare
+_SPELLINGS = {}
+for _form, _entry in _KEYWORDS.items():
+    for _spelling in _spellings(_form):
+        _SPELLINGS.setdefault(_spelling, _entry)
+
+# Punctuația eliminată de la capetele cuvintelor înainte de căutarea în dicționar
+_PUNCTUATION = ".,;:!?()[]{}\"'"
+# Cuvintele se despart și la cratimă / bară: "gri-argintiu", "alb/negru", "hatchback-ul"
+_WORD_SPLIT_RE = re.compile(r"[\s\-/]+")
+# Articolul hotărât lipit de cuvânt: "hatchbackul", "taxiului"
+_SUFFIXES = ("ului", "ul")
+
+# Numere românești: județ (2 litere) + 2 cifre + 3 litere; București: B + 2-3 cifre + 3 litere
+COUNTY_CODES = frozenset((
+    "AB", "AR", "AG", "BC", "BH", "BN", "BT", "BV", "BR", "BZ", "CS", "CL", "CJ", "CT",
+    "CV", "DB", "DJ", "GL", "GR", "GJ", "HR", "HD", "IL", "IS", "IF", "MM", "MH", "MS",
+    "NT", "OT", "PH", "SM", "SJ", "SB", "SV", "TR", "TM", "TL", "VS", "VL", "VN",
+))
+_PLATE_RE = re.compile(r"^(B)(\d{2,3})([A-PR-Z]{3})$|^([A-Z]{2})(\d{2})([A-PR-Z]{3})$")
+_NON_ALNUM_RE = re.compile(r"[^A-Z0-9]")
+UNREADABLE_PLATES = frozenset(("", "NECITIBIL", "NECUNOSCUT", "NA", "NONE"))
+
+
+def fold_diacritics(text):
+    """Elimină diacriticele (ă -> a, ș/ş -> s, ...)"""
+    if text.isascii():
+        return text
+    # str.replace în lanț e mai rapid decât str.translate pentru câteva caractere
+    for accented, plain in _DIACRITICS:
+        text = text.replace(accented, plain)
+    if text.isascii():
+        return text
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+@lru_cache(maxsize=4096)
+def normalize_vehicle_description(description):
+    """
+    Normalizează descrierea vehiculului pentru a reduce varianțele
+
+    Returnează "culoare_tip" (prima culoare menționată, tipul cu cea mai mare
+    prioritate), doar una din ele, sau primele 3 cuvinte dacă nu găsim nimic.
+    """
+    if not description:
+        return "unknown"
+
+    desc = description.lower()
+    color, vehicle_type = _match_keywords(desc, _SPELLINGS)
+    if color is None and vehicle_type is None and not desc.isascii():
+        # Diacritice în afara celor românești (ex: forme NFKD) - căutăm în textul normalizat
+        desc = fold_diacritics(desc)
+        color, vehicle_type = _match_keywords(desc, _KEYWORDS)
+
+    parts = [p for p in (color, vehicle_type) if p]
+    if not parts:
+        # Dacă nu am găsit nici culoare nici tip, folosim primele 3 cuvinte
+        return '_'.join(fold_diacritics(desc).split()[:3])
+    return '_'.join(parts)
+
+
+def _match_keywords(desc, keywords):
+    """(prima culoare menționată, tipul cu cea mai mare prioritate) din textul cu litere mici"""
+    color = None
+    vehicle_type = None
+    best_priority = len(TYPE_FORMS)
+    # Regex-ul doar pentru descrierile cu cuvinte compuse; split() simplu e de câteva ori mai rapid
+    words = _WORD_SPLIT_RE.split(desc) if "-" in desc or "/" in desc else desc.split()
+    for word in words:
+        # Punctuația și articolul se elimină doar când cuvântul nu se găsește direct
+        entry = keywords.get(word)
+        if entry is None:
+            word = word.strip(_PUNCTUATION)
+            entry = keywords.get(word) or _lookup_stem(word, keywords)
+            if entry is None:
+                continue
+        if entry[0] == "color":
+            if color is None:
+                color = entry[1]
+        elif entry[2] < best_priority:
+            vehicle_type, best_priority = entry[1], entry[2]
+    return color, vehicle_type
+
+
+def _lookup_stem(word, keywords):
+    """Caută cuvântul fără articolul hotărât ("hatchbackul" -> "hatchback")"""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) > len(suffix) + 1:
+            entry = keywords.get(word[:-len(suffix)])
+            if entry is not None:
+                return entry
+    return None
+
+
+@lru_cache(maxsize=4096)
+def canonicalize_plate(plate):
+    """
+    Forma canonică a numărului (majuscule, fără spații/cratime/diacritice): "TM 12 ABC" -> "TM12ABC"
+
+    Returns:
+        Numărul canonic sau None dacă modelul a răspuns "necitibil" / nimic
+    """
+    if not plate:
+        return None
+    compact = _NON_ALNUM_RE.sub("", fold_diacritics(plate).upper())
+    if compact in UNREADABLE_PLATES:
+        return None
+    return compact
+
+
+def is_valid_plate(plate):
+    """Verifică dacă numărul (canonic sau nu) respectă formatul românesc"""
+    compact = canonicalize_plate(plate)
+    if not compact:
+        return False
+    match = _PLATE_RE.match(compact)
+    if not match:
+        return False
+    return match.group(1) == "B" or match.group(4) in COUNTY_CODES
+
+
+def format_plate(plate):
+    """Numărul în formatul afișat pe plăcuță ("TM 12 ABC"); nevalidele rămân în forma canonică"""
+    compact = canonicalize_plate(plate)
+    if not compact:
+        return None
+    match = _PLATE_RE.match(compact)
+    if not match or not is_valid_plate(compact):
+        return compact
+    groups = match.groups()[:3] if match.group(1) else match.groups()[3:]
+    return " ".join(groups)
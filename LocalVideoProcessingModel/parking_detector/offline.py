@@ -0,0 +1,305 @@
+"""
+Procesare offline a înregistrărilor video (mai rapid decât timpul real)
+
+Aplică aceeași logică ca procesarea live (change gate, deduplicare, raportare),
+dar folosește timestamp-urile din video în loc de frame_count / fps și procesează
+mai multe camere în paralel. Înregistrările unei camere (același folder) se procesează
+în ordine, în același proces, cu stare de deduplicare comună.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from .backend import handle_gemini_result, is_known_plate
+from .change_gate import ChangeGate
+from .gemini_client import configure, log_usage, send_to_gemini
+from .gps import read_gps_coords
+from .plate_ocr import read_plate
+
+VIDEO_EXTENSIONS = ['.mp4', '.avi', '.mov', '.mkv', '.webm']
+MODEL_RETRIES = 3      # încercări per frame (429 / 503 sunt frecvente cu mai multe procese în paralel)
+RETRY_BACKOFF = 2.0    # secunde înainte de a doua încercare, apoi dublate
+
+
+def _init_worker(single_thread_decode):
+    """Configurează Gemini (și OpenCV) în fiecare proces worker"""
+    configure()
+    if single_thread_decode:
+        import cv2
+
+        # Paralelizăm pe fișiere, nu în interiorul decoderului
+        cv2.setNumThreads(1)
+
+
+def _frame_timestamp(cap, frame_index, fps):
+    """Timestamp-ul (secunde) al ultimului frame citit, din container dacă este disponibil"""
+    import cv2
+
+    pos_msec = cap.get(cv2.CAP_PROP_POS_MSEC)
+    if pos_msec > 0 or frame_index == 0:
+        return pos_msec / 1000.0
+    return frame_index / fps if fps > 0 else 0.0
+
+
+def _analyze_frame(frame, name, retries=MODEL_RETRIES, backoff=RETRY_BACKOFF):
+    """
+    send_to_gemini cu reîncercări și backoff exponențial
+
+    Returns:
+        (text, usage) sau None dacă toate încercările au eșuat (frame-ul se sare)
+    """
+    for attempt in range(1, retries + 1):
+        try:
+            return send_to_gemini(frame)
+        except Exception as e:
+            print(f"❌ [{name}] Eroare la apelul Gemini (încercarea {attempt}/{retries}): {e}")
+            if attempt < retries:
+                time.sleep(backoff * 2 ** (attempt - 1))
+    return None
+
+
+def process_recording(video_path, interval=10, submit=True, gps_path="gps_coords.txt", start_time=None,
+                      plate_ocr=False, reported=None, sightings=None):
+    """
+    Procesează o înregistrare video cât de repede permite decodarea
+
+    Args:
+        video_path: Calea către fișierul video
+        interval: Secunde (din video) între două analize
+        submit: Dacă False, încălcările nu sunt trimise la backend
+        gps_path: Fișierul cu coordonatele GPS ale camerei
+        start_time: Momentul de start al înregistrării (implicit mtime - durată)
+        plate_ocr: Citire locală a numerelor înainte de model (în procesul curent)
+        reported / sightings: Starea de deduplicare, comună înregistrărilor aceleiași camere
+            (implicit nouă pentru fiecare înregistrare)
+
+    Returns:
+        Dict cu statisticile procesării
+    """
+    import cv2
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Nu pot deschide video: {video_path}")
+
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if start_time is None:
+        duration = total_frames / fps if fps > 0 else 0
+        start_time = datetime.fromtimestamp(os.path.getmtime(video_path) - duration)
+
+    latitude, longitude = read_gps_coords(gps_path)
+    change_gate = ChangeGate()
+    reported = {} if reported is None else reported
+    sightings = {} if sightings is None else sightings
+    # Deduplicarea folosește timpul absolut, ca să fie comparabil între înregistrări consecutive
+    start_seconds = start_time.timestamp()
+
+    stats = {
+        "path": video_path,
+        "frames": 0,
+        "decoded": 0,
+        "gated": 0,
+        "model_calls": 0,
+        "model_errors": 0,
+        "ocr_skipped": 0,
+        "none": 0,
+        "duplicate": 0,
+        "reported": 0,
+        "failed": 0,
+        "skipped": 0,
+        "prompt_tokens": 0,
+        "response_tokens": 0,
+    }
+
+    next_analysis = 0.0
+    video_time = 0.0
+    started = time.perf_counter()
+
+    while True:
+        # grab() avansează fără conversia în BGR; retrieve() doar pentru frame-urile analizate
+        if not cap.grab():
+            break
+        video_time = _frame_timestamp(cap, stats["frames"], fps)
+        stats["frames"] += 1
+
+        if video_time < next_analysis:
+            continue
+        next_analysis = video_time + interval
+
+        ret, frame = cap.retrieve()
+        if not ret:
+            continue
+        stats["decoded"] += 1
+
+        if not change_gate.should_analyze(frame, video_time):
+            stats["gated"] += 1
+            continue
+
+        local_plate = read_plate(frame) if plate_ocr else None
+        if is_known_plate(local_plate, latitude, longitude, now=start_seconds + video_time, reported=reported,
+                          sightings=sightings):
+            stats["ocr_skipped"] += 1
+            continue
+
+        print(f"\n⏱ [{os.path.basename(video_path)}] Analiză la secunda {int(video_time)}")
+        response = _analyze_frame(frame, os.path.basename(video_path))
+        if response is None:
+            # O eroare trecătoare a API-ului nu oprește restul înregistrării
+            stats["model_errors"] += 1
+            continue
+        result, usage = response
+        stats["model_calls"] += 1
+        stats["prompt_tokens"] += usage["prompt_tokens"]
+        stats["response_tokens"] += usage["response_tokens"]
+
+        status = "none"
+        if result:
+            status = handle_gemini_result(
+                result, frame, latitude, longitude,
+                now=start_seconds + video_time,
+                reported=reported,
+                incident_time=start_time + timedelta(seconds=video_time),
+                submit=submit,
+                local_plate=local_plate,
+                sightings=sightings
+            )
+            stats[status] += 1
+        log_usage(usage, status, source=os.path.basename(video_path), video_time=round(video_time, 2),
+                  response=result)
+
+    cap.release()
+
+    wall_time = time.perf_counter() - started
+    stats["video_seconds"] = video_time
+    stats["wall_seconds"] = wall_time
+    stats["speedup"] = video_time / wall_time if wall_time > 0 else 0.0
+    return stats
+
+
+def process_camera(video_paths, interval=10, submit=True, gps_path="gps_coords.txt", plate_ocr=False):
+    """
+    Procesează în ordine înregistrările unei camere, cu deduplicare comună
+
+    Un vehicul care apare la sfârșitul unei înregistrări și la începutul următoarei
+    e raportat o singură dată. O înregistrare care nu poate fi procesată nu le oprește
+    pe celelalte.
+
+    Returns:
+        Lista cu statisticile fiecărei înregistrări procesate
+    """
+    reported = {}
+    sightings = {}
+    results = []
+    # mtime = sfârșitul înregistrării, deci ordonează fișierele cronologic
+    for path in sorted(video_paths, key=os.path.getmtime):
+        try:
+            results.append(process_recording(path, interval, submit, gps_path, plate_ocr=plate_ocr,
+                                             reported=reported, sightings=sightings))
+        except Exception as e:
+            print(f"❌ Eroare la procesarea {path}: {e}")
+    return results
+
+
+def group_by_camera(videos, split_files=False):
+    """
+    Grupează înregistrările pe camere: un folder = o cameră
+
+    Cu split_files fiecare fișier devine propriul grup (paralelism maxim, fără
+    deduplicare între înregistrări).
+    """
+    if split_files:
+        return [[path] for path in videos]
+    groups = {}
+    for path in videos:
+        groups.setdefault(os.path.dirname(os.path.abspath(path)), []).append(path)
+    return list(groups.values())
+
+
+def find_videos(paths):
+    """Returnează lista de fișiere video din căile date (fișiere sau foldere)"""
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if any(name.lower().endswith(ext) for ext in VIDEO_EXTENSIONS):
+                    videos.append(os.path.join(path, name))
+        elif os.path.exists(path):
+            videos.append(path)
+        else:
+            print(f"❌ Fișier inexistent: {path}")
+    return videos
+
+
+def print_summary(results):
+    """Afișează viteza față de timpul real pentru fiecare fișier și total"""
+    print("\n" + "=" * 60)
+    print("REZUMAT PROCESARE OFFLINE")
+    print("=" * 60)
+    for stats in results:
+        print(f"{os.path.basename(stats['path'])}: "
+              f"{stats['video_seconds']:.0f}s video în {stats['wall_seconds']:.1f}s "
+              f"({stats['speedup']:.1f}x timp real) | "
+              f"frame-uri {stats['frames']}, decodate {stats['decoded']}, "
+              f"filtrate {stats['gated']}, apeluri model {stats['model_calls']}, "
+              f"erori model {stats['model_errors']}, "
+              f"evitate prin OCR local {stats['ocr_skipped']}, "
+              f"raportate {stats['reported'] + stats['skipped']}, duplicate {stats['duplicate']}, "
+              f"token-i {stats['prompt_tokens']}+{stats['response_tokens']}")
+
+
+def main():
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    parser = argparse.ArgumentParser(description="Procesare offline a înregistrărilor video")
+    parser.add_argument("paths", nargs="*", default=["videos"], help="Fișiere video sau foldere (implicit: videos/)")
+    parser.add_argument("--interval", type=float, default=10, help="Secunde de video între analize (implicit: 10)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Camere procesate în paralel")
+    parser.add_argument("--no-submit", action="store_true", help="Nu trimite încălcările la backend")
+    parser.add_argument("--gps", default="gps_coords.txt", help="Fișierul cu coordonatele GPS")
+    parser.add_argument("--plate-ocr", action="store_true",
+                        help="Citire locală a numerelor (necesită modelul OCR, vezi plate_ocr.py)")
+    parser.add_argument("--split-files", action="store_true",
+                        help="Procesează fiecare fișier separat, în paralel (un vehicul prins în două "
+                             "înregistrări consecutive se raportează de două ori)")
+    args = parser.parse_args()
+
+    videos = find_videos(args.paths)
+    if not videos:
+        print("❌ Nu am găsit fișiere video de procesat!")
+        sys.exit(1)
+
+    groups = group_by_camera(videos, args.split_files)
+    workers = max(1, min(args.workers, len(groups)))
+    unit = "fișiere separate" if args.split_files else "camere"
+    print(f"📼 {len(videos)} înregistrări ({len(groups)} {unit}), {workers} procese în paralel")
+
+    results = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(workers > 1,)) as pool:
+        futures = {
+            pool.submit(process_camera, group, args.interval, not args.no_submit, args.gps,
+                        plate_ocr=args.plate_ocr): group
+            for group in groups
+        }
+        for future in as_completed(futures):
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                print(f"❌ Eroare la procesarea {', '.join(futures[future])}: {e}")
+    wall_time = time.perf_counter() - started
+
+    if not results:
+        sys.exit(1)
+
+    print_summary(sorted(results, key=lambda s: s["path"]))
+    total_video = sum(s["video_seconds"] for s in results)
+    print("-" * 60)
+    print(f"TOTAL: {total_video:.0f}s video în {wall_time:.1f}s "
+          f"({total_video / wall_time if wall_time > 0 else 0:.1f}x timp real)")
+
+
+if __name__ == "__main__":
+    main()
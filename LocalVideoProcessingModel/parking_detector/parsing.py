@@ -0,0 +1,37 @@
+"""
+Parsarea răspunsului Gemini și normalizarea descrierii vehiculului (doar biblioteca standard)
+"""
+from .normalization import normalize_vehicle_description
+
+
+# Funcție pentru a extrage descrierea vehiculului din răspunsul AI
+def extract_vehicle_description(ai_response):
+    """Extrage descrierea vehiculului (culoare și tip) din răspunsul AI"""
+    for line in ai_response.split('\n'):
+        if 'DESCRIERE_VEHICUL' in line or 'DESCRIERE_VEHICUL' in line:
+            description = line.split(':', 1)[1].strip()
+            return description if description else None
+    return None
+
+
+# Funcție pentru a extrage numărul de înmatriculare din răspunsul AI
+def extract_plate_number(ai_response):
+    """Extrage numărul de înmatriculare din răspunsul AI"""
+    for line in ai_response.split('\n'):
+        if 'NUMĂR_ÎNMATRICULARE' in line or 'NUMAR_INMATRICULARE' in line:
+            # Extrage textul după ':'
+            plate = line.split(':', 1)[1].strip()
+            # Ignore dacă este NECITIBIL
+            if plate and plate.upper() != 'NECITIBIL':
+                return plate
+    return None
+
+
+# Funcție pentru a genera un ID unic bazat pe locație și descriere
+def generate_vehicle_id(lat, lon, vehicle_description):
+    """Generează un ID unic pentru vehicul bazat pe locație și descriere"""
+    # Rotunjim coordonatele la 3 zecimale (~111 metri precizie) pentru a permite mai multă toleranță
+    location_key = f"{round(lat, 3)}_{round(lon, 3)}"
+    # Normalizăm descrierea agresiv
+    desc_normalized = normalize_vehicle_description(vehicle_description)
+    return f"{location_key}_{desc_normalized}"
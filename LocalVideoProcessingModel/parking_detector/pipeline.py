@@ -0,0 +1,583 @@
+"""
+Pipeline-ul live pe etape, cu cozi limitate și degradare controlată
+
+captură → gate (planificator + change gate + OCR local) → model → geocodare → trimitere
+
+Fiecare etapă rulează în firul ei; între etape sunt cozi BoundedQueue care, când se
+umplu, aruncă elementul cel mai vechi. Memoria rămâne astfel limitată oricât de lent
+ar răspunde modelul sau backend-ul, iar captura nu se blochează niciodată.
+
+Controlerul verifică periodic frame-urile aruncate, așteptarea în coada modelului,
+latența modelului și circuitele și aplică:
+  1. frame-urile vechi sunt aruncate din cozi (frame-ul cel mai recent contează)
+  2. intervalul de analiză crește (scheduler.load_factor x2 când etapele rămân în urmă,
+     x4 cât timp circuitul modelului nu e închis), deci mai puține apeluri
+  3. geocodarea se amână cât timp backend-ul nu primește incidente sau modelul e căzut
+Revenirea la normal se face după `recover_after` secunde fără presiune. Incidentele
+din cozi păstrează doar JPEG-ul trimis la model, nu frame-ul decodat.
+
+CircuitBreaker oprește apelurile la model / backend după eșecuri repetate (excepții sau
+răspunsuri mai lente decât `slow_call`) și le reîncearcă cu o singură cerere de probă.
+Frame-urile refuzate de circuitul modelului nu ajung la model (bugetul se returnează);
+incidentele așteaptă în coadă până când backend-ul își revine.
+"""
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import datetime
+
+from .backend import handle_gemini_result, is_known_plate, send_incident_to_backend
+from .change_gate import ChangeGate
+from .dedup import plate_sightings, reported_vehicles
+from .gemini_client import analyze_jpeg, encode_jpeg, log_usage
+from .geocoding import UNKNOWN_ADDRESS, get_address_from_coords
+
+CAPTURE_QUEUE = 1        # frame-uri între captură și gate, pentru fiecare cameră (cel mai recent)
+INFERENCE_QUEUE = 4      # frame-uri care așteaptă modelul (cel mult unul per cameră)
+INCIDENT_QUEUE = 100     # incidente care așteaptă geocodarea / trimiterea
+MAX_SUBMIT_ATTEMPTS = 5
+PENDING_TIMEOUT = 5      # secunde în care o cameră scadentă trebuie să trimită un frame
+TICK = 0.2
+
+LOAD_FACTORS = (1.0, 2.0, 4.0)  # factorul intervalului de analiză pe nivel de presiune
+ADDRESS_CACHE_SIZE = 256
+
+Capture = namedtuple("Capture", "camera_id time frame")
+Job = namedtuple("Job", "camera_id time image score local_plate")  # image: frame BGR sau JPEG
+Incident = namedtuple("Incident", "vehicle_id result image plate_number latitude longitude "
+                                  "incident_time address attempts")
+
+
+class BoundedQueue:
+    """
+    Coadă FIFO thread-safe limitată; put() aruncă elementul cel mai vechi când e plină (maxsize=0: nelimitată)
+
+    Cu `key` (ex: camera elementului), limita se aplică separat pentru fiecare cheie: put() aruncă
+    cel mai vechi element cu aceeași cheie, deci o sursă rapidă nu împinge afară elementele celorlalte.
+    """
+
+    def __init__(self, name, maxsize, key=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.key = key
+        self.dropped = 0
+        self.high_water = 0
+        self._items = deque()
+        self._counts = {}  # elemente în coadă pe cheie (doar cu `key`)
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def capacity(self):
+        """Numărul maxim de elemente în coadă (cu `key`: maxsize pentru fiecare cheie văzută)"""
+        return self.maxsize * max(1, len(self._counts)) if self.key else self.maxsize
+
+    def fill(self):
+        """Gradul de umplere (0.0 - 1.0; 0 pentru cozi nelimitate)"""
+        return len(self._items) / self.capacity if self.maxsize else 0.0
+
+    def _full(self, key):
+        if not self.maxsize:
+            return False
+        if self.key:
+            return self._counts.get(key, 0) >= self.maxsize
+        return len(self._items) >= self.maxsize
+
+    def _count(self, item, delta):
+        if self.key:
+            key = self.key(item)
+            self._counts[key] = self._counts.get(key, 0) + delta
+
+    def put(self, item):
+        """Adaugă elementul; returnează elementul aruncat pentru a-i face loc (sau None)"""
+        with self._cond:
+            dropped = None
+            key = self.key(item) if self.key else None
+            if self._full(key):
+                if self.key:
+                    dropped = next(old for old in self._items if self.key(old) == key)
+                    self._items.remove(dropped)
+                else:
+                    dropped = self._items.popleft()
+                self._count(dropped, -1)
+                self.dropped += 1
+            self._items.append(item)
+            self._count(item, 1)
+            self.high_water = max(self.high_water, len(self._items))
+            self._cond.notify()
+            return dropped
+
+    def requeue(self, item):
+        """Pune elementul înapoi la începutul cozii; dacă între timp s-a umplut, îl returnează (aruncat)"""
+        with self._cond:
+            if self._full(self.key(item) if self.key else None):
+                self.dropped += 1
+                return item
+            self._items.appendleft(item)
+            self._count(item, 1)
+            self._cond.notify()
+            return None
+
+    def get(self, timeout=TICK):
+        """Primul element sau None dacă coada rămâne goală `timeout` secunde"""
+        with self._cond:
+            if not self._items:
+                self._cond.wait(timeout)
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._count(item, -1)
+            return item
+
+    def drain(self):
+        """Golește coada și returnează elementele rămase"""
+        with self._cond:
+            items = list(self._items)
+            self._items.clear()
+            self._counts = dict.fromkeys(self._counts, 0)
+            return items
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker pentru un apel extern (model, backend)
+
+    closed: apelurile trec; după `failure_threshold` eșecuri consecutive circuitul se deschide
+    open: apelurile sunt refuzate imediat timp de `reset_timeout` secunde
+    half_open: trece o singură cerere de probă; succesul închide circuitul, eșecul îl redeschide
+    Un apel mai lent decât `slow_call` secunde contează ca eșec (rezultatul se folosește totuși).
+    """
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=30, slow_call=None, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call = slow_call
+        self.clock = clock
+        self.state = "closed"
+        self.failures = 0
+        self.trips = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Poate porni un apel acum?"""
+        with self._lock:
+            if self.state == "open":
+                if self.clock() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open":
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def record(self, ok, latency=None):
+        """Rezultatul unui apel permis de allow()"""
+        with self._lock:
+            if ok and (self.slow_call is None or latency is None or latency <= self.slow_call):
+                if self.state != "closed":
+                    print(f"✓ Circuit {self.name} închis - apelurile reiau")
+                self.state = "closed"
+                self.failures = 0
+                self._probing = False
+                return
+
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.trips += 1
+                    print(f"⚡ Circuit {self.name} deschis după {self.failures} eșecuri - "
+                          f"pauză {self.reset_timeout:g}s")
+                self.state = "open"
+                self.opened_at = self.clock()
+                self._probing = False
+
+
+class PipelineCamera:
+    """O sursă de frame-uri: read() returnează un frame OpenCV (BGR) sau None"""
+
+    def __init__(self, camera_id, read, latitude=None, longitude=None):
+        self.camera_id = camera_id
+        self.read = read
+        self.latitude = latitude
+        self.longitude = longitude
+        self.change_gate = ChangeGate()
+
+
+class LivePipeline:
+    """
+    Etapele pipeline-ului live, legate prin cozi limitate, plus controlerul de încărcare
+
+    Args:
+        scheduler: AdaptiveScheduler / FixedScheduler (timp = time.time())
+        plate_pool: PlateOCRPool pentru citirea locală a numerelor (opțional)
+        analyze / geocode / send / log: apelurile externe (implicit Gemini, Nominatim, backend,
+            jurnalul de utilizare); pot fi înlocuite cu stub-uri (vezi simulate_pipeline.py)
+        latency_target: latența modelului / așteptarea în coadă (secunde, medie) peste care
+            analizele se răresc
+        recover_after: secunde fără presiune înainte de a reveni la un nivel inferior
+        queue_sizes: (captură per cameră, model, incidente); 0 = nelimitată
+    """
+
+    def __init__(self, scheduler, plate_pool=None, analyze=analyze_jpeg, geocode=get_address_from_coords,
+                 send=send_incident_to_backend, log=log_usage, reported=None, sightings=None,
+                 model_breaker=None, backend_breaker=None, latency_target=15.0, recover_after=30.0,
+                 queue_sizes=(CAPTURE_QUEUE, INFERENCE_QUEUE, INCIDENT_QUEUE)):
+        self.scheduler = scheduler
+        self.plate_pool = plate_pool
+        self.analyze = analyze
+        self.geocode = geocode
+        self.send = send
+        self.log = log
+        self.reported = reported_vehicles if reported is None else reported
+        self.sightings = plate_sightings if sightings is None else sightings
+        self.model_breaker = model_breaker or CircuitBreaker("model", slow_call=30.0)
+        self.backend_breaker = backend_breaker or CircuitBreaker("backend")
+        self.latency_target = latency_target
+        self.recover_after = recover_after
+
+        self.captured = BoundedQueue("captură", queue_sizes[0], key=lambda capture: capture.camera_id)
+        self.inference = BoundedQueue("model", queue_sizes[1])
+        self.geocoding = BoundedQueue("geocodare", queue_sizes[2])
+        self.submission = BoundedQueue("trimitere", queue_sizes[2])
+
+        self.cameras = {}
+        self.level = 0
+        self.defer_geocoding = False
+        self.model_latency = None
+        self.queue_wait = None
+        self.stats = {"captured": 0, "analyzed": 0, "model_errors": 0, "model_refused": 0,
+                      "queued": 0, "reported": 0, "submit_errors": 0, "incidents_dropped": 0}
+
+        self._pending = {}            # camere scadente care așteaptă un frame: {camera_id: momentul}
+        self._addresses = {}
+        self._calm_since = None
+        self._frames_dropped = 0
+        self._scheduler_lock = threading.Lock()
+        self._reported_lock = threading.RLock()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def add_camera(self, camera_id, read, latitude=None, longitude=None, priority=1.0):
+        self.cameras[camera_id] = PipelineCamera(camera_id, read, latitude, longitude)
+        self.scheduler.add_camera(camera_id, priority)
+
+    # --- etape ---
+    # Fiecare etapă tratează excepțiile pe element: o eroare neprevăzută (cameră, stub, jurnal)
+    # eliberează camera / abandonează incidentul, iar firul etapei continuă
+
+    def _capture_stage(self, camera):
+        """Citește continuu frame-uri; dacă gate-ul rămâne în urmă se pierd cele mai vechi"""
+        while not self._stop.is_set():
+            try:
+                frame = camera.read()
+            except Exception as e:
+                print(f"❌ [{camera.camera_id}] Eroare la citirea frame-ului: {e}")
+                frame = None
+            if frame is None:
+                self._stop.wait(TICK)
+                continue
+            self.stats["captured"] += 1
+            self.captured.put(Capture(camera.camera_id, time.time(), frame))
+
+    def _gate_stage(self):
+        """Planificator + change gate + OCR local; frame-urile care trec merg la model"""
+        while not self._stop.is_set():
+            item = self.captured.get()
+            try:
+                self._grant_due(time.time())
+            except Exception as e:
+                print(f"❌ Eroare în planificator: {e}")
+
+            if item is None or item.camera_id not in self._pending:
+                continue
+            del self._pending[item.camera_id]
+            try:
+                self._gate(item)
+            except Exception as e:
+                print(f"❌ [{item.camera_id}] Eroare în etapa gate: {e}")
+                self._finish(item.camera_id, item.time, None, analyzed=False)
+
+    def _grant_due(self, now):
+        """Camerele scadente așteaptă următorul frame; cele care nu trimit nimic sunt eliberate"""
+        with self._scheduler_lock:
+            for camera_id in self.scheduler.due(now):
+                self.scheduler.start(camera_id, now)
+                self._pending[camera_id] = now
+            for camera_id, since in list(self._pending.items()):
+                if now - since > PENDING_TIMEOUT:
+                    # Camera nu a trimis niciun frame (conexiune pierdută)
+                    del self._pending[camera_id]
+                    self.scheduler.record(camera_id, now, analyzed=False)
+
+    def _gate(self, item):
+        camera = self.cameras[item.camera_id]
+        if not camera.change_gate.should_analyze(item.frame, item.time):
+            self._finish(item.camera_id, item.time, camera.change_gate.last_score, analyzed=False)
+            return
+
+        image = item.frame
+        local_plate = None
+        if self.plate_pool is not None:
+            # Procesul worker primește JPEG-ul (de câteva ori mai mic decât frame-ul BGR de serializat),
+            # iar modelul îl refolosește fără o nouă codare
+            image = encode_jpeg(item.frame)
+            local_plate = self.plate_pool.read(image)
+        with self._reported_lock:
+            known = is_known_plate(local_plate, camera.latitude, camera.longitude,
+                                   reported=self.reported, sightings=self.sightings)
+        if known:
+            print(f"⏭️ [{item.camera_id}] Număr citit local, vehicul deja raportat - fără apel la model")
+            self._finish(item.camera_id, item.time, camera.change_gate.last_score, analyzed=False)
+            return
+
+        dropped = self.inference.put(Job(item.camera_id, item.time, image,
+                                         camera.change_gate.last_score, local_plate))
+        if dropped is not None:
+            # Frame-ul cel mai vechi nu mai ajunge la model
+            self._finish(dropped.camera_id, dropped.time, dropped.score, analyzed=False)
+
+    def _inference_stage(self):
+        """Apelul la model prin circuit; verdictul trece prin dedup, incidentele intră în coadă"""
+        while not self._stop.is_set():
+            job = self.inference.get()
+            if job is None:
+                continue
+            try:
+                self._infer(job)
+            except Exception as e:
+                print(f"❌ [{job.camera_id}] Eroare în etapa model: {e}")
+                self._finish(job.camera_id, job.time, job.score, analyzed=False)
+
+    def _infer(self, job):
+        if not self.model_breaker.allow():
+            self.stats["model_refused"] += 1
+            self._finish(job.camera_id, job.time, job.score, analyzed=False)
+            return
+
+        camera = self.cameras[job.camera_id]
+        wait = time.time() - job.time
+        self.queue_wait = wait if self.queue_wait is None else 0.7 * self.queue_wait + 0.3 * wait
+        print(f"\n📤 [{job.camera_id}] Se trimite frame-ul către Gemini...")
+        started = time.perf_counter()
+        try:
+            jpeg = job.image if isinstance(job.image, bytes) else encode_jpeg(job.image)
+            result, usage = self.analyze(jpeg)
+        except Exception as e:
+            print(f"❌ [{job.camera_id}] Eroare la apelul Gemini: {e}")
+            self.stats["model_errors"] += 1
+            self.model_breaker.record(False)
+            self._finish(job.camera_id, job.time, job.score, analyzed=False)
+            return
+        latency = time.perf_counter() - started
+        self.model_breaker.record(True, latency)
+        self.model_latency = latency if self.model_latency is None else 0.7 * self.model_latency + 0.3 * latency
+        self.stats["analyzed"] += 1
+
+        status = "none"
+        if result:
+            print(f"\n📥 [{job.camera_id}] Răspuns primit:")
+            print("----------------------------------------")
+            print(result)
+            print("----------------------------------------")
+            with self._reported_lock:
+                status = handle_gemini_result(result, jpeg, camera.latitude, camera.longitude,
+                                              reported=self.reported, local_plate=job.local_plate,
+                                              incident_time=datetime.fromtimestamp(job.time),
+                                              send=self._queue_incident, sightings=self.sightings)
+        else:
+            print(f"❌ [{job.camera_id}] Nu am primit răspuns de la Gemini.")
+
+        self.log(usage, status, camera=job.camera_id, response=result)
+        self._finish(job.camera_id, job.time, job.score, violation=status != "none")
+
+    def _geocoding_stage(self):
+        """Adresa incidentului (cache pe coordonate - camerele sunt fixe); amânată sub presiune"""
+        while not self._stop.is_set():
+            if self.defer_geocoding:
+                self._stop.wait(TICK)
+                continue
+            incident = self.geocoding.get()
+            if incident is None:
+                continue
+            try:
+                self._geocode_incident(incident)
+            except Exception as e:
+                self._abandon(incident, f"eroare la geocodare: {e}")
+
+    def _geocode_incident(self, incident):
+        key = (round(incident.latitude, 5), round(incident.longitude, 5))
+        address = self._addresses.get(key)
+        if address is None:
+            address = self.geocode(incident.latitude, incident.longitude)
+            if address != UNKNOWN_ADDRESS:
+                if len(self._addresses) >= ADDRESS_CACHE_SIZE:
+                    self._addresses.clear()
+                self._addresses[key] = address
+
+        dropped = self.submission.put(incident._replace(address=address))
+        if dropped is not None:
+            self._abandon(dropped, "coada de trimitere plină")
+
+    def _submission_stage(self):
+        """Trimite incidentele la backend prin circuit; cele eșuate se reîncearcă"""
+        while not self._stop.is_set():
+            incident = self.submission.get()
+            if incident is None:
+                continue
+            try:
+                self._submit(incident)
+            except Exception as e:
+                self._abandon(incident, f"eroare la trimitere: {e}")
+
+    def _submit(self, incident):
+        if not self.backend_breaker.allow():
+            dropped = self.submission.requeue(incident)
+            if dropped is not None:
+                self._abandon(dropped, "coada de trimitere plină")
+            self._stop.wait(TICK)
+            return
+
+        started = time.perf_counter()
+        try:
+            ok = self.send(incident.result, incident.image, incident.plate_number, incident.latitude,
+                           incident.longitude, incident.incident_time, address=incident.address)
+        except Exception as e:
+            print(f"❌ Eroare la trimiterea incidentului: {e}")
+            ok = False
+        self.backend_breaker.record(ok, time.perf_counter() - started)
+
+        if ok:
+            self.stats["reported"] += 1
+            return
+        self.stats["submit_errors"] += 1
+        if incident.attempts + 1 >= MAX_SUBMIT_ATTEMPTS:
+            self._abandon(incident, f"{MAX_SUBMIT_ATTEMPTS} încercări eșuate")
+            return
+        dropped = self.submission.requeue(incident._replace(attempts=incident.attempts + 1))
+        if dropped is not None:
+            self._abandon(dropped, "coada de trimitere plină")
+
+    # --- controler ---
+
+    def _pressure_level(self):
+        """0 = normal, 1 = etapele rămân în urmă (frame-uri aruncate, model lent), 2 = circuitul modelului deschis"""
+        dropped = self.captured.dropped + self.inference.dropped
+        shedding = dropped > self._frames_dropped
+        self._frames_dropped = dropped
+        if self.model_breaker.state != "closed":
+            return 2
+        slow = any(value is not None and value > self.latency_target
+                   for value in (self.model_latency, self.queue_wait))
+        if shedding or slow:
+            return 1
+        return 0
+
+    def control(self, now=None):
+        """Un pas al controlerului: nivelul de presiune, intervalul de analiză, amânarea geocodării"""
+        now = time.monotonic() if now is None else now
+        level = self._pressure_level()
+        if level >= self.level:
+            self._calm_since = None
+        elif self._calm_since is None:
+            self._calm_since = now
+        if level > self.level or (self._calm_since is not None and now - self._calm_since >= self.recover_after):
+            if level != self.level:
+                print(f"{'⚠️' if level > self.level else '✓'} Nivel de încărcare {self.level} -> {level}: "
+                      f"interval de analiză x{LOAD_FACTORS[level]:g}")
+            self.level = level
+            self._calm_since = None
+            with self._scheduler_lock:
+                self.scheduler.load_factor = LOAD_FACTORS[level]
+
+        defer = (self.level == 2 or self.backend_breaker.state != "closed"
+                 or self.submission.fill() >= 0.5)
+        if defer != self.defer_geocoding:
+            print("⏸️ Geocodare amânată" if defer else "▶️ Geocodare reluată")
+            self.defer_geocoding = defer
+
+    def status(self):
+        """Instantaneu pentru monitorizare: cozi, circuite, nivel și contoare"""
+        queues = (self.captured, self.inference, self.geocoding, self.submission)
+        return {
+            "level": self.level,
+            "load_factor": LOAD_FACTORS[self.level],
+            "defer_geocoding": self.defer_geocoding,
+            "model_circuit": self.model_breaker.state,
+            "backend_circuit": self.backend_breaker.state,
+            "model_latency": self.model_latency,
+            "queue_wait": self.queue_wait,
+            "queues": {queue.name: len(queue) for queue in queues},
+            "high_water": {queue.name: queue.high_water for queue in queues},
+            "dropped": {queue.name: queue.dropped for queue in queues},
+            **self.stats,
+        }
+
+    # --- ajutătoare ---
+
+    def _finish(self, camera_id, capture_time, score, violation=False, analyzed=True):
+        with self._scheduler_lock:
+            self.scheduler.record(camera_id, capture_time, score, violation=violation, analyzed=analyzed)
+
+    def _queue_incident(self, vehicle_id, result, image, plate_number, latitude, longitude, incident_time):
+        """send pentru handle_gemini_result: incidentul intră în coada de geocodare"""
+        incident = Incident(vehicle_id, result, image, plate_number, latitude, longitude,
+                            incident_time or datetime.now(), None, 0)
+        self.stats["queued"] += 1
+        dropped = self.geocoding.put(incident)
+        if dropped is not None:
+            self._abandon(dropped, "coada de geocodare plină")
+        return True
+
+    def _abandon(self, incident, reason):
+        """Renunță la un incident; vehiculul iese din evidență ca să poată fi raportat din nou"""
+        with self._reported_lock:
+            self.reported.pop(incident.vehicle_id, None)
+        self.stats["incidents_dropped"] += 1
+        print(f"❌ Incident abandonat ({reason}): {incident.vehicle_id}")
+
+    # --- pornire / oprire ---
+
+    def start(self):
+        """Pornește firele etapelor"""
+        self._stop.clear()
+        targets = [(self._capture_stage, (camera,)) for camera in self.cameras.values()]
+        targets += [(self._gate_stage, ()), (self._inference_stage, ()),
+                    (self._geocoding_stage, ()), (self._submission_stage, ())]
+        self._threads = [threading.Thread(target=target, args=args, daemon=True) for target, args in targets]
+        for thread in self._threads:
+            thread.start()
+
+    def run(self, duration=None, on_tick=None, interval=1.0):
+        """
+        Rulează controlerul în firul curent până la Ctrl+C (sau `duration` secunde)
+
+        Args:
+            on_tick: Funcție apelată cu status() după fiecare pas al controlerului
+        """
+        self.start()
+        deadline = None if duration is None else time.monotonic() + duration
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                self._stop.wait(interval)
+                self.control()
+                if on_tick is not None:
+                    on_tick(self.status())
+        finally:
+            self.stop()
+
+    def stop(self, timeout=5):
+        """Oprește etapele; incidentele încă netrimise sunt abandonate"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self.captured.drain()
+        self.inference.drain()
+        for incident in self.geocoding.drain() + self.submission.drain():
+            self._abandon(incident, "pipeline oprit")
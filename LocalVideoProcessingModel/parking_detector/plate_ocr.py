@@ -0,0 +1,274 @@
+"""
+Citirea locală (CPU) a numerelor de înmatriculare
+
+Localizare clasică OpenCV (black-hat + gradient orizontal + contururi cu proporțiile
+unei plăcuțe) urmată de un model OCR mic (CRNN în format ONNX, rulat cu cv2.dnn) pe
+frame-ul la rezoluție completă. Textul citit este corectat după formatul românesc
+(O/0, I/1, S/5, B/8, Z/2 în funcție de poziție) și primește un scor de încredere.
+
+Modelul nu este inclus în repository: implicit models/plate_ocr_crnn.onnx (sau
+variabila PLATE_OCR_MODEL), de ex. text_recognition_CRNN_EN_2021sep.onnx din
+OpenCV Zoo. Fără model, etapa este dezactivată și totul merge ca înainte.
+"""
+import os
+from collections import namedtuple
+
+from .normalization import canonicalize_plate, is_valid_plate
+
+PLATE_OCR_MODEL = os.getenv("PLATE_OCR_MODEL", os.path.join("models", "plate_ocr_crnn.onnx"))
+OCR_CHARSET = "0123456789abcdefghijklmnopqrstuvwxyz"
+OCR_INPUT_SIZE = (100, 32)
+MIN_CONFIDENCE = 0.6
+CORRECTION_PENALTY = 0.9  # factor aplicat încrederii pentru fiecare caracter corectat
+OCR_TIMEOUT = 5
+
+WORK_WIDTH = 1280       # localizarea rulează pe o copie micșorată
+MAX_CANDIDATES = 5
+MIN_ASPECT, MAX_ASPECT = 2.5, 8.0   # plăcuța UE are ~4.7:1, banda de caractere poate fi mai alungită
+MIN_AREA, MAX_AREA = 0.0003, 0.05   # fracțiune din frame
+
+# (litere județ, cifre) + 3 litere: "TM 12 ABC", "B 12 ABC", "B 123 ABC"
+_LAYOUTS = ((2, 2), (1, 2), (1, 3))
+_TO_LETTER = str.maketrans("01258", "OIZSB")
+_TO_DIGIT = str.maketrans("OIZSBQDG", "01258006")
+
+PlateReading = namedtuple("PlateReading", "plate confidence raw box")
+
+
+def plate_from_text(text):
+    """
+    Potrivește textul OCR pe formatul românesc
+
+    Returns:
+        (numărul canonic valid sau None, câte caractere au fost corectate)
+    """
+    compact = canonicalize_plate(text)
+    if not compact:
+        return None, 0
+    # Banda UE din stânga poate fi citită ca "RO" (sau un caracter parazit) în fața numărului
+    for start in range(min(3, len(compact))):
+        rest = compact[start:]
+        for letters, digits in _LAYOUTS:
+            if len(rest) != letters + digits + 3:
+                continue
+            fixed = (rest[:letters].translate(_TO_LETTER)
+                     + rest[letters:letters + digits].translate(_TO_DIGIT)
+                     + rest[letters + digits:].translate(_TO_LETTER))
+            if is_valid_plate(fixed):
+                return fixed, sum(a != b for a, b in zip(rest, fixed))
+    return None, 0
+
+
+def ctc_decode(scores, charset=OCR_CHARSET):
+    """
+    Decodare CTC greedy a ieșirii CRNN (T x clase, clasa 0 = blank)
+
+    Returns:
+        (text, încrederea = probabilitatea minimă a caracterelor emise)
+    """
+    import numpy as np
+
+    # softmax funcționează și pentru ieșiri log-softmax
+    probs = np.exp(scores - scores.max(axis=1, keepdims=True))
+    probs /= probs.sum(axis=1, keepdims=True)
+
+    text = []
+    confidences = []
+    previous = 0
+    for index, probability in zip(probs.argmax(axis=1), probs.max(axis=1)):
+        if index != 0 and index != previous:
+            text.append(charset[index - 1])
+            confidences.append(float(probability))
+        previous = index
+    return "".join(text), min(confidences) if confidences else 0.0
+
+
+def _order_box(box):
+    """Colțurile în ordinea stânga-jos, stânga-sus, dreapta-sus, dreapta-jos"""
+    import numpy as np
+
+    by_x = box[np.argsort(box[:, 0])]
+    left = by_x[:2][np.argsort(by_x[:2, 1])]
+    right = by_x[2:][np.argsort(by_x[2:, 1])]
+    return np.array([left[1], left[0], right[0], right[1]], dtype=np.float32)
+
+
+def locate_plates(frame, max_candidates=MAX_CANDIDATES):
+    """
+    Găsește zonele care arată ca o plăcuță de înmatriculare
+
+    Returns:
+        Listă de colțuri (4x2 float32, coordonate în frame), cele mai probabile primele
+    """
+    import cv2
+    import numpy as np
+
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    scale = min(1.0, WORK_WIDTH / gray.shape[1])
+    small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else gray
+
+    # Caractere închise pe fond deschis: black-hat le scoate în evidență, gradientul pe x le unește
+    blackhat = cv2.morphologyEx(small, cv2.MORPH_BLACKHAT, cv2.getStructuringElement(cv2.MORPH_RECT, (13, 5)))
+    grad = np.absolute(cv2.Sobel(blackhat, cv2.CV_32F, 1, 0, ksize=3))
+    grad = cv2.normalize(grad, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+    grad = cv2.GaussianBlur(grad, (5, 5), 0)
+    grad = cv2.morphologyEx(grad, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (17, 5)))
+    _, mask = cv2.threshold(grad, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    mask = cv2.dilate(cv2.erode(mask, None, iterations=2), None, iterations=2)
+
+    # Plăcuța este mai deschisă decât împrejurimile
+    _, light = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    mask = cv2.bitwise_and(mask, cv2.dilate(light, None, iterations=3))
+
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    frame_area = float(small.shape[0] * small.shape[1])
+    candidates = []
+    for contour in contours:
+        rect = cv2.minAreaRect(contour)
+        width, height = sorted(rect[1], reverse=True)
+        if height < 8:
+            continue
+        area = width * height
+        if not (MIN_ASPECT <= width / height <= MAX_ASPECT and MIN_AREA <= area / frame_area <= MAX_AREA):
+            continue
+        fill = cv2.contourArea(contour) / area
+        candidates.append((fill, rect))
+
+    candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+    boxes = []
+    for _, (center, size, angle) in candidates[:max_candidates]:
+        # Puțin spațiu în jurul caracterelor
+        padded = (center, (size[0] * 1.15, size[1] * 1.3), angle)
+        boxes.append(_order_box(cv2.boxPoints(padded) / scale))
+    return boxes
+
+
+class PlateReader:
+    """Localizare + OCR pentru un proces (modelul se încarcă o singură dată)"""
+
+    def __init__(self, model_path=PLATE_OCR_MODEL, charset=OCR_CHARSET):
+        import cv2
+        import numpy as np
+
+        self.net = cv2.dnn.readNet(model_path)
+        self.charset = charset
+        width, height = OCR_INPUT_SIZE
+        self._target = np.array([[0, height - 1], [0, 0], [width - 1, 0], [width - 1, height - 1]],
+                                dtype=np.float32)
+
+    def recognize(self, gray, box):
+        """Textul brut și încrederea pentru o zonă (colțuri ordonate ca în _order_box)"""
+        import cv2
+
+        matrix = cv2.getPerspectiveTransform(box, self._target)
+        crop = cv2.warpPerspective(gray, matrix, OCR_INPUT_SIZE)
+        blob = cv2.dnn.blobFromImage(crop, scalefactor=1 / 127.5, size=OCR_INPUT_SIZE, mean=127.5)
+        self.net.setInput(blob)
+        scores = self.net.forward()
+        return ctc_decode(scores.reshape(scores.shape[0], -1), self.charset)
+
+    def read(self, frame, max_candidates=MAX_CANDIDATES):
+        """
+        Citește numerele valide din frame
+
+        Returns:
+            Listă de PlateReading, ordonată descrescător după încredere
+        """
+        import cv2
+
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        readings = {}
+        for box in locate_plates(gray, max_candidates):
+            raw, confidence = self.recognize(gray, box)
+            plate, corrections = plate_from_text(raw)
+            if not plate:
+                continue
+            confidence *= CORRECTION_PENALTY ** corrections
+            if plate not in readings or confidence > readings[plate].confidence:
+                readings[plate] = PlateReading(plate, round(confidence, 3), raw, box.tolist())
+        return sorted(readings.values(), key=lambda reading: reading.confidence, reverse=True)
+
+
+_readers = {}
+
+
+def get_reader(model_path=None):
+    """PlateReader-ul procesului curent, sau None dacă modelul OCR lipsește"""
+    model_path = model_path or PLATE_OCR_MODEL
+    if model_path not in _readers:
+        if os.path.exists(model_path):
+            _readers[model_path] = PlateReader(model_path)
+        else:
+            print(f"⚠️ Modelul OCR {model_path} lipsește - citirea locală a numerelor este dezactivată")
+            _readers[model_path] = None
+    return _readers[model_path]
+
+
+def read_plate(image, model_path=None, min_confidence=MIN_CONFIDENCE):
+    """
+    Cel mai sigur număr citit local
+
+    Args:
+        image: Frame OpenCV (BGR) sau octeții JPEG de la cameră
+
+    Returns:
+        PlateReading cu încrederea >= min_confidence, altfel None (modelul decide)
+    """
+    reader = get_reader(model_path)
+    if reader is None:
+        return None
+    if isinstance(image, (bytes, bytearray)):
+        import cv2
+        import numpy as np
+
+        image = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            return None
+    readings = reader.read(image)
+    if readings and readings[0].confidence >= min_confidence:
+        return readings[0]
+    return None
+
+
+def _init_worker(model_path):
+    """Un fir OpenCV per proces; modelul se încarcă o singură dată"""
+    import cv2
+
+    cv2.setNumThreads(1)
+    get_reader(model_path)
+
+
+class PlateOCRPool:
+    """Procese worker pentru OCR, ca localizarea și modelul să nu blocheze captura"""
+
+    def __init__(self, workers=None, model_path=None, min_confidence=MIN_CONFIDENCE):
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.model_path = model_path or PLATE_OCR_MODEL
+        self.min_confidence = min_confidence
+        self.enabled = os.path.exists(self.model_path)
+        if not self.enabled:
+            print(f"⚠️ Modelul OCR {self.model_path} lipsește - citirea locală a numerelor este dezactivată")
+            self._pool = None
+            return
+        workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(self.model_path,))
+
+    def submit(self, image):
+        """Pornește citirea în fundal; returnează un Future cu PlateReading sau None"""
+        return self._pool.submit(read_plate, image, self.model_path, self.min_confidence)
+
+    def read(self, image, timeout=OCR_TIMEOUT):
+        """Citește numărul și așteaptă rezultatul (None dacă OCR-ul eșuează sau e dezactivat)"""
+        if not self.enabled:
+            return None
+        try:
+            return self.submit(image).result(timeout=timeout)
+        except Exception as e:
+            print(f"❌ OCR local eșuat: {e}")
+            return None
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,164 @@
+"""
+Planificator de analiză: decide când trimitem un frame de la fiecare cameră la model
+
+FixedScheduler păstrează comportamentul vechi (o analiză la fiecare 10 secunde).
+AdaptiveScheduler calculează un interval dinamic pe cameră din activitatea recentă
+a scenei, rata de încălcări și ora din zi, respectând un buget global de apeluri
+la model pe minut (cu prioritate pentru zonele fierbinți).
+
+Ambele acceptă analize asincrone (pipeline.LivePipeline): start() ocupă slotul camerei
+până la record(), iar load_factor (>1) rărește analizele când pipeline-ul rămâne în urmă.
+"""
+from datetime import datetime
+
+# Factor aplicat intervalului în funcție de oră (<1 = analize mai dese)
+DEFAULT_HOURLY_FACTORS = {
+    **{hour: 2.0 for hour in range(0, 6)},    # noaptea trafic redus
+    **{hour: 0.7 for hour in range(7, 10)},   # ora de vârf dimineața
+    **{hour: 0.7 for hour in range(16, 20)},  # ora de vârf seara
+}
+
+
+class FixedScheduler:
+    """Analiză la interval fix pentru fiecare cameră (comportamentul inițial)"""
+
+    def __init__(self, interval=10):
+        self.interval = interval
+        self.load_factor = 1.0
+        self.last_analysis = {}
+        self.busy = set()
+
+    def add_camera(self, camera_id, priority=1.0):
+        self.last_analysis.setdefault(camera_id, None)
+
+    def due(self, now):
+        """Returnează camerele care trebuie analizate acum"""
+        interval = self.interval * self.load_factor
+        return [camera_id for camera_id, last in self.last_analysis.items()
+                if camera_id not in self.busy and (last is None or now - last >= interval)]
+
+    def start(self, camera_id, now):
+        """Analiza camerei a început (rezultatul vine mai târziu prin record)"""
+        self.busy.add(camera_id)
+
+    def record(self, camera_id, now, change_score=None, violation=False, analyzed=True):
+        self.busy.discard(camera_id)
+        self.last_analysis[camera_id] = now
+
+
+class CameraState:
+    """Statistici recente pentru o cameră"""
+
+    def __init__(self, priority=1.0):
+        self.priority = priority       # >1 pentru zone fierbinți
+        self.activity = 0.0            # medie exponențială a scorului de schimbare
+        self.violation_rate = 0.0      # medie exponențială a verdictelor cu încălcare
+        self.last_analysis = None
+        self.interval = None
+        self.busy = False              # analiză în curs (start() fără record() încă)
+
+
+class AdaptiveScheduler:
+    """
+    Interval dinamic pe cameră + buget global de apeluri la model
+
+    Args:
+        calls_per_minute: Bugetul global de apeluri la model (toate camerele)
+        base_interval: Intervalul de pornire în secunde
+        min_interval / max_interval: Limitele intervalului pe cameră
+        activity_weight / violation_weight: Cât de mult scurtează intervalul activitatea și încălcările
+        smoothing: Ponderea observației noi în mediile exponențiale
+        hourly_factors: {oră: factor} aplicat intervalului
+        clock: Funcție care transformă `now` în datetime (pentru ora din zi)
+    """
+
+    def __init__(self, calls_per_minute=30, base_interval=10, min_interval=3, max_interval=60,
+                 activity_weight=20.0, violation_weight=3.0, smoothing=0.3,
+                 hourly_factors=None, clock=datetime.fromtimestamp):
+        self.calls_per_minute = calls_per_minute
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.activity_weight = activity_weight
+        self.violation_weight = violation_weight
+        self.smoothing = smoothing
+        self.hourly_factors = DEFAULT_HOURLY_FACTORS if hourly_factors is None else hourly_factors
+        self.clock = clock
+        self.cameras = {}
+
+        # Factor >1 aplicat de pipeline când o etapă rămâne în urmă (poate depăși max_interval)
+        self.load_factor = 1.0
+
+        # Token bucket pentru bugetul global
+        self.tokens = float(calls_per_minute)
+        self.last_refill = None
+
+    def add_camera(self, camera_id, priority=1.0):
+        if camera_id not in self.cameras:
+            self.cameras[camera_id] = CameraState(priority)
+        else:
+            self.cameras[camera_id].priority = priority
+
+    def interval_for(self, camera_id, now):
+        """Intervalul curent (secunde) pentru o cameră"""
+        state = self.cameras[camera_id]
+        hour_factor = self.hourly_factors.get(self.clock(now).hour, 1.0)
+        boost = (1.0
+                 + self.activity_weight * state.activity
+                 + self.violation_weight * state.violation_rate) * state.priority
+        interval = self.base_interval * hour_factor / boost
+        return max(self.min_interval, min(self.max_interval, interval)) * self.load_factor
+
+    def _refill(self, now):
+        if self.last_refill is not None:
+            elapsed = max(0.0, now - self.last_refill)
+            self.tokens = min(self.calls_per_minute, self.tokens + elapsed * self.calls_per_minute / 60.0)
+        self.last_refill = now
+
+    def due(self, now):
+        """
+        Returnează camerele care trebuie analizate acum, în limita bugetului
+
+        Camerele întârziate sunt ordonate după prioritate × cât de mult au depășit
+        intervalul; cele care nu primesc buget rămân scadente la pasul următor.
+        """
+        self._refill(now)
+
+        candidates = []
+        for camera_id, state in self.cameras.items():
+            state.interval = self.interval_for(camera_id, now)
+            if state.busy:
+                continue
+            if state.last_analysis is None:
+                overdue = float("inf")
+            else:
+                overdue = (now - state.last_analysis) / state.interval
+            if overdue >= 1.0:
+                candidates.append((state.priority * overdue, camera_id))
+
+        candidates.sort(reverse=True)
+        granted = []
+        for _, camera_id in candidates:
+            if self.tokens < 1.0:
+                break
+            self.tokens -= 1.0
+            granted.append(camera_id)
+        return granted
+
+    def start(self, camera_id, now):
+        """Analiza camerei a început: nu mai e scadentă până la record()"""
+        self.cameras[camera_id].busy = True
+
+    def record(self, camera_id, now, change_score=None, violation=False, analyzed=True):
+        """Actualizează statisticile camerei după o verificare (analizată de model sau filtrată)"""
+        state = self.cameras[camera_id]
+        state.busy = False
+        if change_score is not None:
+            state.activity += self.smoothing * (change_score - state.activity)
+        if analyzed:
+            state.violation_rate += self.smoothing * (float(violation) - state.violation_rate)
+        else:
+            # Frame-ul nu a ajuns la model - returnăm apelul în buget
+            self.tokens = min(self.calls_per_minute, self.tokens + 1.0)
+        # O verificare filtrată de change gate consumă tot un slot din programul camerei
+        state.last_analysis = now
@@ -0,0 +1,291 @@
+"""
+Simulare chaos: LivePipeline cu camere, model, geocodare și backend locale (stub)
+
+Camerele stub produc frame-uri la `fps` (scena se schimbă la fiecare secundă), modelul
+stub răspunde în `--latency` secunde, backend-ul stub acceptă incidentele. Pe parcursul
+rulării se injectează, după un program fix (scalat cu --scale):
+  - un vârf de latență al modelului
+  - o pană a modelului (excepții, ca send_to_gemini când API-ul nu răspunde)
+  - o pană a backend-ului (suprapusă parțial peste pana modelului)
+
+Raportează evoluția cozilor, a circuitelor și a memoriei (tracemalloc + RSS maxim), apoi
+cât durează revenirea după fiecare defect: circuit închis, nivel de încărcare 0, cozile
+de incidente golite. La final verifică (cod de ieșire 1 dacă o verificare eșuează):
+  - vârful tracemalloc rămâne sub limita calculată din cozile de frame-uri
+  - fiecare defect a produs cel puțin un eșec (excepție, apel lent, trimitere eșuată) sau
+    a deschis circuitul - altfel revenirea lui nu dovedește nimic
+  - circuitele se închid în cel mult --max-recovery secunde după sfârșitul fiecărui defect
+  - cozile de incidente se golesc după pana backend-ului și sunt goale la sfârșitul rulării
+"""
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+
+from .pipeline import CircuitBreaker, LivePipeline
+from .scheduler import AdaptiveScheduler
+
+# (început, sfârșit, defect) în secunde de la pornire, înainte de --scale
+FAULTS = [
+    (10, 30, "model_slow"),
+    (40, 55, "model_down"),
+    (50, 70, "backend_down"),
+]
+DURATION = 90
+VARIANTS = 6
+PLATES = [f"TM {number:02d} {letters}" for number in range(10, 100) for letters in ("ABC", "XYZ", "KLM")]
+
+
+class FaultSchedule:
+    """Ce defect este activ la momentul curent"""
+
+    def __init__(self, faults, scale=1.0):
+        self.faults = [(start * scale, end * scale, kind) for start, end, kind in faults]
+        self.started = time.monotonic()
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def active(self, kind):
+        t = self.elapsed()
+        return any(start <= t < end and fault == kind for start, end, fault in self.faults)
+
+
+class StubCamera:
+    """Frame-uri sintetice la `fps`; în fiecare secundă un "vehicul" apare într-o poziție aleatoare"""
+
+    def __init__(self, fps, size, seed):
+        import numpy as np
+
+        self.interval = 1.0 / fps
+        self.next_frame = time.monotonic()
+        rng = np.random.default_rng(seed)
+        width, height = size
+        # Gradient + zgomot slab: se comprimă ca o imagine reală (~100-200 KB JPEG)
+        gradient = np.linspace(60, 180, width, dtype=np.float32)[None, :, None]
+        noise = rng.normal(0, 4, (height, width, 3)).astype(np.float32)
+        background = np.clip(gradient + noise, 0, 255).astype(np.uint8)
+        self.seed = seed
+        self.variants = []
+        for index in range(VARIANTS):
+            frame = background.copy()
+            x = width * index // (VARIANTS + 1)
+            frame[height // 2:height // 2 + height // 6, x:x + width // 6] = (40, 40, 200)
+            self.variants.append(frame)
+
+    def read(self):
+        self.next_frame += self.interval
+        time.sleep(max(0.0, self.next_frame - time.monotonic()))
+        # Poziția nu e periodică (altfel un interval de analiză multiplu de perioadă ar vedea
+        # mereu aceeași scenă); frame nou la fiecare citire, ca la o cameră reală
+        second = int(time.monotonic())
+        return self.variants[random.Random(second * 1000 + self.seed).randrange(VARIANTS)].copy()
+
+
+def stub_model(schedule, latency, spike_latency, violation_rate, rng):
+    def analyze(jpeg):
+        if schedule.active("model_down"):
+            time.sleep(0.2)
+            raise ConnectionError("503 Service Unavailable (stub)")
+        time.sleep(spike_latency if schedule.active("model_slow") else latency)
+        if rng.random() < violation_rate:
+            text = (f"ÎNCĂLCARE: DA\nNUMĂR_ÎNMATRICULARE: {rng.choice(PLATES)}\n"
+                    "DESCRIERE_VEHICUL: Dacia Logan albă\nLOCAȚIE_ÎNCĂLCARE: trecere de pietoni")
+        else:
+            text = "ÎNCĂLCARE: NU"
+        return text, {"image_bytes": len(jpeg), "latency": latency}
+    return analyze
+
+
+def stub_backend(schedule, latency):
+    def send(ai_response, frame, plate_number, latitude, longitude, incident_time=None, address=None):
+        time.sleep(latency)
+        return not schedule.active("backend_down")
+    return send
+
+
+def stub_geocode(latency):
+    def geocode(lat, lon):
+        time.sleep(latency)
+        return "Strada Simulării 1", "Cetate"
+    return geocode
+
+
+def max_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def recovery(samples, end, done):
+    """Secunde de la `end` până la primul eșantion care îndeplinește `done` (None dacă nu se întâmplă)"""
+    for t, status in samples:
+        if t >= end and done(status):
+            return t - end
+    return None
+
+
+def fault_evidence(samples, start, end, counter, failing):
+    """
+    Eșecurile produse de un defect: creșterea contorului `counter` din status între `start`
+    și `end` și numărul de eșantioane în care `failing(status)` e adevărat
+    """
+    window = [status for t, status in samples if start <= t <= end]
+    if not window:
+        return 0, 0
+    before = [status for t, status in samples if t < start]
+    first = before[-1][counter] if before and counter else (window[0][counter] if counter else 0)
+    delta = window[-1][counter] - first if counter else 0
+    return delta, sum(1 for status in window if failing(status))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulare chaos pentru pipeline-ul live (stub-uri locale)")
+    parser.add_argument("--cameras", type=int, default=4,
+                        help="Peste INFERENCE_QUEUE camere, și coada modelului aruncă frame-uri")
+    parser.add_argument("--fps", type=float, default=10)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--latency", type=float, default=0.3, help="Latența normală a modelului stub")
+    parser.add_argument("--spike-latency", type=float, default=4.0, help="Latența în timpul vârfului")
+    parser.add_argument("--violation-rate", type=float, default=0.4)
+    parser.add_argument("--scale", type=float, default=1.0, help="Scalează programul defectelor")
+    parser.add_argument("--max-recovery", type=float, default=10.0,
+                        help="Secunde după sfârșitul unui defect în care circuitul trebuie să fie închis")
+    parser.add_argument("--verbose", action="store_true", help="Afișează și mesajele pipeline-ului")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    import tracemalloc
+
+    rng = random.Random(args.seed)
+    schedule = FaultSchedule(FAULTS, args.scale)
+    scheduler = AdaptiveScheduler(calls_per_minute=120, base_interval=2, min_interval=1, max_interval=10)
+    pipeline = LivePipeline(
+        scheduler,
+        analyze=stub_model(schedule, args.latency, args.spike_latency, args.violation_rate, rng),
+        geocode=stub_geocode(0.2),
+        send=stub_backend(schedule, 0.05),
+        log=lambda *a, **k: None,
+        reported={},
+        model_breaker=CircuitBreaker("model", failure_threshold=3, reset_timeout=5, slow_call=2.0),
+        backend_breaker=CircuitBreaker("backend", failure_threshold=3, reset_timeout=5),
+        latency_target=2.0,
+        recover_after=5.0,
+    )
+    for index in range(args.cameras):
+        camera = StubCamera(args.fps, (args.width, args.height), seed=index)
+        pipeline.add_camera(f"cam_{index:02d}", camera.read, 45.7489 + index * 0.001, 21.2087)
+
+    frame_mb = args.width * args.height * 3 / 2 ** 20
+    print(f"{args.cameras} camere x {args.fps:g} fps, frame {args.width}x{args.height} ({frame_mb:.1f} MB)")
+    for start, end, kind in schedule.faults:
+        print(f"   {start:5.0f}-{end:<5.0f}s {kind}")
+    print(f"\n{'t':>4} {'niv':>3} {'model':>9} {'backend':>9} {'captură':>7} {'model':>5} {'geo':>4} "
+          f"{'trim':>4} {'analize':>7} {'raport':>6} {'mem MB':>7}")
+
+    out = sys.stdout
+    samples = []
+    peak_mb = [0.0]
+
+    def on_tick(status):
+        t = schedule.elapsed()
+        current, _ = tracemalloc.get_traced_memory()
+        peak_mb[0] = max(peak_mb[0], current / 2 ** 20)
+        samples.append((t, status))
+        if len(samples) % 25 == 0:
+            queues = status["queues"]
+            print(f"{t:4.0f} {status['level']:>3} {status['model_circuit']:>9} {status['backend_circuit']:>9} "
+                  f"{queues['captură']:>7} {queues['model']:>5} {queues['geocodare']:>4} "
+                  f"{queues['trimitere']:>4} {status['analyzed']:>7} {status['reported']:>6} "
+                  f"{current / 2 ** 20:>7.1f}", file=out)
+
+    tracemalloc.start()
+    started = time.monotonic()
+    devnull = open(os.devnull, "w", encoding="utf-8")
+    with contextlib.redirect_stdout(out if args.verbose else devnull):
+        pipeline.run(duration=DURATION * args.scale, on_tick=on_tick, interval=0.2)
+    devnull.close()
+    elapsed = time.monotonic() - started
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak_mb[0] = max(peak_mb[0], traced_peak / 2 ** 20)
+
+    status = pipeline.status()
+    print(f"\nDupă {elapsed:.0f}s: {status['captured']} frame-uri capturate, {status['analyzed']} analize, "
+          f"{status['model_errors']} erori model, {status['model_refused']} refuzate de circuit")
+    print(f"Incidente: {status['queued']} în coadă, {status['reported']} trimise, "
+          f"{status['submit_errors']} încercări eșuate, {status['incidents_dropped']} abandonate")
+    print("Cozi (maxim / capacitate / aruncate): " + ", ".join(
+        f"{queue.name} {queue.high_water}/{queue.capacity}/{queue.dropped}"
+        for queue in (pipeline.captured, pipeline.inference, pipeline.geocoding, pipeline.submission)))
+    print(f"Circuite deschise: model {pipeline.model_breaker.trips}x, backend {pipeline.backend_breaker.trips}x")
+    bound_mb = (pipeline.captured.capacity + pipeline.inference.maxsize + args.cameras) * frame_mb
+    margin_mb = bound_mb - peak_mb[0]
+    print(f"Memorie: vârf tracemalloc {peak_mb[0]:.1f} MB, limita (frame-uri în cozi) {bound_mb:.1f} MB, "
+          f"marjă {margin_mb:.1f} MB ({100 * margin_mb / bound_mb:.0f}%), RSS maxim {max_rss_mb():.0f} MB")
+
+    failures = []
+    if peak_mb[0] >= bound_mb:
+        failures.append(f"vârf tracemalloc {peak_mb[0]:.1f} MB peste limita de {bound_mb:.0f} MB")
+
+    slow_call = pipeline.model_breaker.slow_call
+    # Defect -> (contorul de eșecuri din status, starea care arată că defectul a lovit)
+    evidence = {
+        "model_slow": (None, lambda s: s["model_circuit"] != "closed" or (s["model_latency"] or 0) > slow_call),
+        "model_down": ("model_errors", lambda s: s["model_circuit"] != "closed"),
+        "backend_down": ("submit_errors", lambda s: s["backend_circuit"] != "closed"),
+    }
+
+    print("\nRevenire după defect:")
+    for start, end, kind in schedule.faults:
+        counter, failing = evidence[kind]
+        # Eșecurile pot apărea și puțin după sfârșit (apeluri lente în curs), dar nu din defectul următor
+        window_end = min([end + args.max_recovery] + [other for other, _, _ in schedule.faults if other > start])
+        errors, failing_samples = fault_evidence(samples, start, window_end, counter, failing)
+        print(f"   {kind:<13} eșecuri {errors}, eșantioane cu circuit deschis / apeluri lente {failing_samples}")
+        if not errors and not failing_samples:
+            failures.append(f"{kind}: defectul nu a produs niciun eșec sau circuit deschis - revenirea nu se validează")
+            continue
+
+        # (nume, condiție, verificată față de --max-recovery)
+        if kind == "backend_down":
+            checks = [
+                ("circuit backend închis", lambda s: s["backend_circuit"] == "closed", True),
+                ("incidente trimise (cozi goale)", lambda s: s["backend_circuit"] == "closed"
+                 and s["queues"]["geocodare"] == 0 and s["queues"]["trimitere"] == 0, True),
+            ]
+        else:
+            checks = [
+                ("circuit model închis", lambda s: s["model_circuit"] == "closed", True),
+                ("nivel de încărcare 0", lambda s: s["level"] == 0, False),
+            ]
+        results = []
+        for name, done, required in checks:
+            seconds = recovery(samples, end, done)
+            results.append(f"{name} după {seconds:.1f}s" if seconds is not None else f"{name}: nu")
+            if required and (seconds is None or seconds > args.max_recovery):
+                failures.append(f"{kind}: {name} " + (f"după {seconds:.1f}s" if seconds is not None else "niciodată")
+                                + f" (limita {args.max_recovery:g}s)")
+        print(f"   {'':<13} " + ", ".join(results))
+
+    # Ultimul eșantion e luat înainte de stop(), care abandonează incidentele rămase
+    last_queues = samples[-1][1]["queues"] if samples else {}
+    if last_queues.get("geocodare") or last_queues.get("trimitere"):
+        failures.append(f"cozi de incidente negolite la final: geocodare {last_queues['geocodare']}, "
+                        f"trimitere {last_queues['trimitere']}")
+
+    if failures:
+        print("\n❌ Verificări eșuate:")
+        for failure in failures:
+            print(f"   {failure}")
+        sys.exit(1)
+    print("\n✓ Toate verificările au trecut")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Simulare: latența de detecție vs. apeluri la model pentru planificarea fixă și cea adaptivă
+
+Rejoacă o urmă de activitate (un eșantion pe secundă pentru fiecare cameră) prin
+FixedScheduler și AdaptiveScheduler. Urma poate fi citită dintr-un CSV
+(time,camera_id,change_score,violation_id) sau generată sintetic.
+"""
+import argparse
+import csv
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from .scheduler import AdaptiveScheduler, FixedScheduler
+
+GATE_THRESHOLD = 0.01  # același prag ca ChangeGate
+
+
+def trace_clock(t):
+    """Timpul din urmă = secunde de la miezul nopții"""
+    return datetime(2000, 1, 1) + timedelta(seconds=t)
+
+
+def generate_trace(cameras=10, hours=4, hot_cameras=2, start_hour=7, seed=42):
+    """
+    Generează o urmă sintetică de activitate
+
+    Camerele "fierbinți" au de câteva ori mai multe încălcări. Traficul de trecere
+    (care declanșează change gate fără încălcare) depinde de ora din zi.
+
+    Returns:
+        Listă de tuple (time, camera_id, change_score, violation_id)
+    """
+    rng = random.Random(seed)
+    duration = int(hours * 3600)
+    start = start_hour * 3600
+    rows = []
+
+    for cam in range(cameras):
+        camera_id = f"cam_{cam:02d}"
+        hot = cam < hot_cameras
+        violation_rate = (6 if hot else 1) / 3600.0  # încălcări pe secundă
+        active_until = -1
+        violation_id = ""
+        arrival_spike = 0
+
+        for t in range(duration):
+            hour = ((start + t) // 3600) % 24
+            busy = 0.02 if hour in (7, 8, 9, 16, 17, 18, 19) else 0.005
+
+            score = rng.uniform(0.0, 0.004)
+            if rng.random() < busy:
+                score = rng.uniform(0.02, 0.08)  # trafic care trece prin cadru
+
+            if t > active_until and rng.random() < violation_rate:
+                active_until = t + rng.randint(120, 1200)
+                violation_id = f"{camera_id}_{t}"
+                arrival_spike = 5
+            if arrival_spike > 0:
+                score = max(score, rng.uniform(0.05, 0.2))
+                arrival_spike -= 1
+            if t == active_until:
+                score = max(score, rng.uniform(0.05, 0.2))  # vehiculul pleacă
+
+            rows.append((start + t, camera_id, round(score, 4), violation_id if t < active_until else ""))
+
+    rows.sort()
+    return rows
+
+
+def load_trace(path):
+    """Citește o urmă CSV cu coloanele time,camera_id,change_score,violation_id"""
+    rows = []
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            rows.append((float(row["time"]), row["camera_id"], float(row["change_score"]), row["violation_id"]))
+    rows.sort()
+    return rows
+
+
+def save_trace(rows, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["time", "camera_id", "change_score", "violation_id"])
+        writer.writerows(rows)
+
+
+def simulate(scheduler, rows, hot_cameras=()):
+    """
+    Rulează planificatorul peste urmă
+
+    O verificare ajunge la model doar dacă scena s-a schimbat de la ultimul apel
+    (change gate). Latența = momentul primului apel care vede încălcarea - începutul ei.
+    """
+    samples = defaultdict(dict)
+    violation_start = {}
+    cameras = []
+    for t, camera_id, score, violation_id in rows:
+        samples[t][camera_id] = (score, violation_id)
+        if camera_id not in cameras:
+            cameras.append(camera_id)
+        if violation_id and violation_id not in violation_start:
+            violation_start[violation_id] = t
+
+    for camera_id in cameras:
+        scheduler.add_camera(camera_id, priority=2.0 if camera_id in hot_cameras else 1.0)
+
+    change_since_call = defaultdict(lambda: 1.0)
+    calls = 0
+    latencies = {}
+
+    for t in sorted(samples):
+        for camera_id, (score, _) in samples[t].items():
+            change_since_call[camera_id] = max(change_since_call[camera_id], score)
+
+        for camera_id in scheduler.due(t):
+            score, violation_id = samples[t].get(camera_id, (0.0, ""))
+            if change_since_call[camera_id] < GATE_THRESHOLD:
+                scheduler.record(camera_id, t, change_score=score, analyzed=False)
+                continue
+
+            calls += 1
+            change_since_call[camera_id] = 0.0
+            if violation_id and violation_id not in latencies:
+                latencies[violation_id] = t - violation_start[violation_id]
+            scheduler.record(camera_id, t, change_score=score, violation=bool(violation_id))
+
+    duration_minutes = (max(samples) - min(samples) + 1) / 60.0
+    ordered = sorted(latencies.values())
+    return {
+        "calls": calls,
+        "calls_per_minute": calls / duration_minutes,
+        "violations": len(violation_start),
+        "detected": len(latencies),
+        "mean_latency": sum(ordered) / len(ordered) if ordered else float("nan"),
+        "p95_latency": ordered[int(0.95 * (len(ordered) - 1))] if ordered else float("nan"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulare planificare fixă vs. adaptivă")
+    parser.add_argument("--trace", help="CSV cu urma de activitate (implicit: urmă sintetică)")
+    parser.add_argument("--save-trace", help="Salvează urma sintetică în acest CSV")
+    parser.add_argument("--cameras", type=int, default=10)
+    parser.add_argument("--hot", type=int, default=2, help="Număr de camere în zone fierbinți")
+    parser.add_argument("--hours", type=float, default=4)
+    parser.add_argument("--budget", type=float, default=20, help="Apeluri la model pe minut (adaptiv)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.trace:
+        rows = load_trace(args.trace)
+    else:
+        rows = generate_trace(args.cameras, args.hours, args.hot, seed=args.seed)
+        if args.save_trace:
+            save_trace(rows, args.save_trace)
+
+    camera_ids = sorted({row[1] for row in rows})
+    hot_cameras = set(camera_ids[:args.hot])
+
+    schedules = [
+        ("fix 10s", FixedScheduler(10)),
+        ("fix 30s", FixedScheduler(30)),
+        (f"adaptiv {args.budget:g}/min", AdaptiveScheduler(calls_per_minute=args.budget, clock=trace_clock)),
+    ]
+
+    print(f"Urmă: {len(camera_ids)} camere, {len(rows)} eșantioane, zone fierbinți: {', '.join(sorted(hot_cameras))}")
+    print(f"{'Planificare':<20}{'apeluri':>10}{'apel/min':>10}{'detectate':>12}{'lat. medie':>12}{'lat. p95':>10}")
+    for name, scheduler in schedules:
+        r = simulate(scheduler, rows, hot_cameras)
+        print(f"{name:<20}{r['calls']:>10}{r['calls_per_minute']:>10.1f}"
+              f"{r['detected']:>6}/{r['violations']:<5}{r['mean_latency']:>11.1f}s{r['p95_latency']:>9.0f}s")
+
+
+if __name__ == "__main__":
+    main()
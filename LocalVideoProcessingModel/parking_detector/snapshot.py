@@ -0,0 +1,303 @@
+"""
+Captură prin snapshot-uri: o imagine JPEG de la IP Webcam (/shot.jpg) doar când
+planificatorul decide o analiză, în loc să decodăm continuu stream-ul /video
+
+Toate camerele folosesc o singură sesiune HTTP cu conexiuni keep-alive refolosite;
+fiecare cameră scadentă primește propriul task asyncio, deci o cameră lentă nu le
+întârzie pe celelalte, iar bucla continuă să bifeze în timp ce verificările rulează. JPEG-ul se decodează
+doar la rezoluție redusă, în tonuri de gri, pentru change gate, iar la model și la
+backend ajung direct octeții primiți de la cameră (fără decodare + recodare).
+Apelurile la model trec prin același CircuitBreaker ca pipeline-ul stream (pipeline.py):
+o eroare nu mai oprește bucla, iar cât timp circuitul e deschis modelul nu e apelat.
+"""
+import argparse
+import sys
+import threading
+import time
+from datetime import datetime
+
+from .backend import handle_gemini_result, is_known_plate
+from .change_gate import ChangeGate
+from .gemini_client import analyze_jpeg, configure, log_usage
+from .gps import read_gps_coords
+from .pipeline import CircuitBreaker
+from .plate_ocr import PlateOCRPool
+from .scheduler import AdaptiveScheduler
+
+SNAPSHOT_PATH = "/shot.jpg"
+HTTP_TIMEOUT = 5
+POLL_TICK = 0.5
+MODEL_CALLS_PER_MINUTE = 12
+
+# Evidența vehiculelor raportate e citită și modificată din firele asyncio.to_thread ale camerelor
+_reported_lock = threading.Lock()
+
+
+def _with_reported_lock(function, *args, **kwargs):
+    with _reported_lock:
+        return function(*args, **kwargs)
+
+
+def snapshot_url(url):
+    """URL-ul imaginii statice pentru un URL IP Webcam (ex: .../video -> .../shot.jpg)"""
+    base = url.rstrip("/")
+    if base.endswith(SNAPSHOT_PATH):
+        return base
+    if base.endswith("/video"):
+        base = base[:-len("/video")]
+    return base + SNAPSHOT_PATH
+
+
+def create_session(pool_size=10):
+    """Sesiune HTTP cu un pool de conexiuni keep-alive (cel puțin una per cameră)"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_snapshot(session, url, timeout=HTTP_TIMEOUT):
+    """Descarcă o imagine de la cameră; returnează octeții JPEG sau None"""
+    try:
+        response = session.get(url, timeout=timeout)
+    except Exception as e:
+        print(f"❌ Nu pot descărca imaginea de la {url}: {e}")
+        return None
+
+    if response.status_code != 200 or not response.content:
+        print(f"❌ Eroare snapshot {url}: {response.status_code}")
+        return None
+    return response.content
+
+
+def decode_gate_frame(jpeg_bytes):
+    """
+    Decodează JPEG-ul la 1/8 din rezoluție, în tonuri de gri
+
+    Change gate lucrează pe o miniatură 64x36, deci nu are nevoie de frame-ul complet;
+    decodorul JPEG sare direct peste detaliile fine (mult mai ieftin decât IMREAD_COLOR).
+    """
+    import cv2
+    import numpy as np
+
+    return cv2.imdecode(np.frombuffer(jpeg_bytes, dtype=np.uint8), cv2.IMREAD_REDUCED_GRAYSCALE_8)
+
+
+class SnapshotCamera:
+    """O cameră IP Webcam interogată prin snapshot-uri"""
+
+    def __init__(self, camera_id, url, latitude=None, longitude=None, priority=1.0):
+        self.camera_id = camera_id
+        self.url = snapshot_url(url)
+        self.latitude = latitude
+        self.longitude = longitude
+        self.priority = priority       # >1 pentru zone fierbinți (scheduler.AdaptiveScheduler)
+        self.change_gate = ChangeGate()
+
+
+async def check_camera(session, camera, scheduler, now, plate_pool=None, breaker=None):
+    """
+    Descarcă, filtrează și (dacă e cazul) analizează un snapshot
+
+    Returns:
+        "unavailable", "unchanged", "duplicate" (număr citit local), "model_unavailable"
+        (eroare sau circuit deschis) sau statusul din handle_gemini_result
+    """
+    import asyncio
+
+    jpeg = await asyncio.to_thread(fetch_snapshot, session, camera.url)
+    gray = decode_gate_frame(jpeg) if jpeg else None
+    if gray is None:
+        scheduler.record(camera.camera_id, now, analyzed=False)
+        return "unavailable"
+
+    if not camera.change_gate.should_analyze(gray, now):
+        print(f"⏭️ [{camera.camera_id}] Scena nu s-a schimbat (scor {camera.change_gate.last_score:.3f})")
+        scheduler.record(camera.camera_id, now, camera.change_gate.last_score, analyzed=False)
+        return "unchanged"
+
+    # Numărul se citește local din JPEG-ul complet (decodat în procesul worker)
+    local_plate = await asyncio.to_thread(plate_pool.read, jpeg) if plate_pool else None
+    if _with_reported_lock(is_known_plate, local_plate, camera.latitude, camera.longitude):
+        print(f"⏭️ [{camera.camera_id}] Număr citit local, vehicul deja raportat - fără apel la model")
+        scheduler.record(camera.camera_id, now, camera.change_gate.last_score, analyzed=False)
+        return "duplicate"
+
+    if breaker is not None and not breaker.allow():
+        scheduler.record(camera.camera_id, now, camera.change_gate.last_score, analyzed=False)
+        return "model_unavailable"
+
+    print(f"\n📤 [{camera.camera_id}] Se trimite snapshot-ul către Gemini ({len(jpeg) // 1024} KB)...")
+    started = time.perf_counter()
+    try:
+        result, usage = await asyncio.to_thread(analyze_jpeg, jpeg)
+    except Exception as e:
+        print(f"❌ [{camera.camera_id}] Eroare la apelul Gemini: {e}")
+        if breaker is not None:
+            breaker.record(False)
+        scheduler.record(camera.camera_id, now, camera.change_gate.last_score, analyzed=False)
+        return "model_unavailable"
+    if breaker is not None:
+        breaker.record(True, time.perf_counter() - started)
+    status = "none"
+
+    if result:
+        print(f"\n📥 [{camera.camera_id}] Răspuns primit:")
+        print("----------------------------------------")
+        print(result)
+        print("----------------------------------------")
+
+        status = await asyncio.to_thread(
+            _with_reported_lock, handle_gemini_result, result, jpeg, camera.latitude, camera.longitude,
+            local_plate=local_plate
+        )
+    else:
+        print(f"❌ [{camera.camera_id}] Nu am primit răspuns de la Gemini.")
+
+    log_usage(usage, status, camera=camera.camera_id, capture="snapshot", response=result)
+    scheduler.record(camera.camera_id, now, camera.change_gate.last_score, violation=status != "none")
+    return status
+
+
+async def _check_camera_safely(session, camera, scheduler, now, plate_pool, breaker):
+    """check_camera într-un task propriu: o excepție eliberează camera fără să oprească bucla"""
+    try:
+        return await check_camera(session, camera, scheduler, now, plate_pool, breaker)
+    except Exception as e:
+        print(f"❌ [{camera.camera_id}] Eroare la verificarea camerei: {e}")
+        scheduler.record(camera.camera_id, now, analyzed=False)
+        return "error"
+
+
+async def poll(cameras, scheduler, session, tick=POLL_TICK, plate_pool=None, breaker=None):
+    """
+    Bucla de interogare: fiecare cameră scadentă e verificată într-un task separat
+
+    Camera rămâne ocupată în planificator (start() ... record()) cât timp task-ul ei
+    rulează, iar bucla continuă să pornească verificări pentru celelalte camere.
+    """
+    import asyncio
+
+    breaker = breaker or CircuitBreaker("model", slow_call=30.0)
+    by_id = {camera.camera_id: camera for camera in cameras}
+    for camera_id, camera in by_id.items():
+        scheduler.add_camera(camera_id, camera.priority)
+
+    running = {}  # {camera_id: task} - verificările în curs
+    try:
+        while True:
+            now = time.time()
+            for camera_id in scheduler.due(now):
+                scheduler.start(camera_id, now)
+                running[camera_id] = asyncio.create_task(
+                    _check_camera_safely(session, by_id[camera_id], scheduler, now, plate_pool, breaker)
+                )
+            await asyncio.sleep(tick)
+            for camera_id in [camera_id for camera_id, task in running.items() if task.done()]:
+                del running[camera_id]
+    finally:
+        for task in running.values():
+            task.cancel()
+
+
+async def _run(cameras, scheduler, plate_ocr):
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Un fir per cameră pentru cererile HTTP / apelurile la model care blochează
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=len(cameras) + 4))
+    session = create_session(pool_size=len(cameras))
+    plate_pool = PlateOCRPool() if plate_ocr else None
+    try:
+        await poll(cameras, scheduler, session, plate_pool=plate_pool)
+    finally:
+        session.close()
+        if plate_pool is not None:
+            plate_pool.close()
+
+
+def run(urls, calls_per_minute=MODEL_CALLS_PER_MINUTE, plate_ocr=False, priorities=None):
+    """
+    Procesare live prin snapshot-uri
+
+    Args:
+        urls: {camera_id: URL IP Webcam} (/video sau /shot.jpg)
+        calls_per_minute: Bugetul de apeluri la model, împărțit între camere
+        plate_ocr: Citire locală a numerelor înainte de model (plate_ocr.PlateOCRPool)
+        priorities: {camera_id: factor} pentru zonele fierbinți (implicit 1.0)
+    """
+    import asyncio
+
+    latitude, longitude = read_gps_coords()
+    if latitude and longitude:
+        print(f"✓ Coordonate GPS: {latitude}, {longitude}")
+    else:
+        print("❌ Nu s-au putut citi coordonatele GPS")
+
+    priorities = priorities or {}
+    cameras = [SnapshotCamera(camera_id, url, latitude, longitude, priorities.get(camera_id, 1.0))
+               for camera_id, url in urls.items()]
+    scheduler = AdaptiveScheduler(calls_per_minute=calls_per_minute, clock=lambda _: datetime.now())
+
+    print(f"📡 Interogare snapshot-uri pentru {len(cameras)} camere... (Ctrl+C pentru ieșire)")
+    try:
+        asyncio.run(_run(cameras, scheduler, plate_ocr))
+    except KeyboardInterrupt:
+        print("\n✓ Procesare oprită")
+    return True
+
+
+def parse_camera(value):
+    """`id=url` sau doar `url` (id-ul devine host-ul)"""
+    if "=" in value.split("://")[0]:
+        camera_id, url = value.split("=", 1)
+        return camera_id, url
+    return value.split("://")[-1].split("/")[0], value
+
+
+def parse_priority(value):
+    """`id=factor` - factorul (>0) scurtează intervalul camerei și o preferă la buget"""
+    camera_id, sep, factor = value.rpartition("=")
+    try:
+        factor = float(factor)
+    except ValueError:
+        factor = None
+    if not sep or not camera_id or factor is None or not 0 < factor < float("inf"):
+        raise argparse.ArgumentTypeError(f"prioritate invalidă '{value}' (format: id=factor, factor > 0)")
+    return camera_id, factor
+
+
+def check_priorities(parser, priorities, camera_ids):
+    """Oprește cu eroare dacă o prioritate se referă la o cameră necunoscută"""
+    unknown = sorted(set(priorities) - set(camera_ids))
+    if unknown:
+        parser.error(f"--priority pentru camere necunoscute: {', '.join(unknown)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detecție prin snapshot-uri IP Webcam (mai multe camere)")
+    parser.add_argument("--camera", action="append", required=True, type=parse_camera,
+                        help="Camera ca id=url (se poate repeta)")
+    parser.add_argument("--calls-per-minute", type=float, default=MODEL_CALLS_PER_MINUTE,
+                        help="Bugetul de apeluri la model pe minut (pentru toate camerele)")
+    parser.add_argument("--plate-ocr", action="store_true",
+                        help="Citire locală a numerelor (necesită modelul OCR, vezi plate_ocr.py)")
+    parser.add_argument("--priority", action="append", default=[], type=parse_priority,
+                        help="Prioritatea unei camere ca id=factor, ex. cam1=2 pentru o zonă fierbinte (se poate repeta)")
+    args = parser.parse_args()
+
+    urls = dict(args.camera)
+    priorities = dict(args.priority)
+    check_priorities(parser, priorities, urls)
+
+    configure()
+    if not run(urls, args.calls_per_minute, args.plate_ocr, priorities):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,6 @@
-import cv2
 import os
-import time
 from datetime import datetime
 from extract_frames import extract_frames
-import requests
 
 # Citire coordonate GPS din fișier
 def read_gps_coords():
@@ -20,16 +17,12 @@ def read_gps_coords():
         print(f"❌ Eroare la citirea GPS: {e}")
         return None, None
 
-# Citire GPS
-latitude, longitude = read_gps_coords()
-if latitude and longitude:
-    print(f"✓ Coordonate GPS: {latitude}, {longitude}")
-else:
-    print("❌ Nu s-au putut citi coordonatele GPS")
-
 # Funcție pentru trimiterea incidentului la backend
-def send_incident_to_backend(frame, timestamp):
+def send_incident_to_backend(frame, timestamp, latitude, longitude):
     """Trimite incidentul detectat la backend"""
+    import cv2
+    import requests
+
     try:
         # Salvează frame-ul
         frame_path = f"incident_frame_{timestamp}.jpg"
@@ -62,50 +55,64 @@ def send_incident_to_backend(frame, timestamp):
         print(f"❌ Eroare la trimiterea incidentului: {e}")
         return False
 
-url = "http://10.47.103.46:8080/video"
-cap = cv2.VideoCapture(url)
+def main():
+    import cv2
 
-fps = 20  # aproximativ, pentru sincronizare
-frame_count = 0
-last_processed_time = 0
-output_folder = "extracted_frames"
-os.makedirs(output_folder, exist_ok=True)
+    # Citire GPS
+    latitude, longitude = read_gps_coords()
+    if latitude and longitude:
+        print(f"✓ Coordonate GPS: {latitude}, {longitude}")
+    else:
+        print("❌ Nu s-au putut citi coordonatele GPS")
 
-print("📡 Procesare video live... (ESC pentru ieșire)")
+    url = "http://10.47.103.46:8080/video"
+    cap = cv2.VideoCapture(url)
 
-while True:
-    ret, frame = cap.read()
-    if not ret:
-        print("❌ Conexiune pierdută cu camera!")
-        break
+    fps = 20  # aproximativ, pentru sincronizare
+    frame_count = 0
+    last_processed_time = 0
+    output_folder = "extracted_frames"
+    os.makedirs(output_folder, exist_ok=True)
 
-    cv2.imshow("Camera telefon - Live", frame)
+    print("📡 Procesare video live... (ESC pentru ieșire)")
 
-    # Procesare la fiecare 10 secunde
-    current_time = frame_count / fps
-    if current_time - last_processed_time >= 10:
-        last_processed_time = current_time
-        timestamp = int(current_time)
-        
-        print(f"\n⏱ Procesare frame la secunda {timestamp}")
-        
-        # Salvăm frame-ul curent într-un fișier temporar
-        temp_frame_path = os.path.join(output_folder, f"frame_at_{timestamp}s.jpg")
-        cv2.imwrite(temp_frame_path, frame)
-        print(f"✓ Frame salvat: {temp_frame_path}")
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            print("❌ Conexiune pierdută cu camera!")
+            break
 
-        # Trimite la backend
-        if latitude and longitude:
-            send_incident_to_backend(frame, timestamp)
-        
-        # Folosim extract_frames pe frame-ul respectiv
-        extract_frames(temp_frame_path, output_folder, num_frames=1)
+        cv2.imshow("Camera telefon - Live", frame)
+
+        # Procesare la fiecare 10 secunde
+        current_time = frame_count / fps
+        if current_time - last_processed_time >= 10:
+            last_processed_time = current_time
+            timestamp = int(current_time)
+
+            print(f"\n⏱ Procesare frame la secunda {timestamp}")
+
+            # Salvăm frame-ul curent într-un fișier temporar
+            temp_frame_path = os.path.join(output_folder, f"frame_at_{timestamp}s.jpg")
+            cv2.imwrite(temp_frame_path, frame)
+            print(f"✓ Frame salvat: {temp_frame_path}")
+
+            # Trimite la backend
+            if latitude and longitude:
+                send_incident_to_backend(frame, timestamp, latitude, longitude)
+
+            # Folosim extract_frames pe frame-ul respectiv
+            extract_frames(temp_frame_path, output_folder, num_frames=1)
+
+        frame_count += 1
+
+        if cv2.waitKey(1) == 27:  # ESC pentru a opri
+            break
 
-    frame_count += 1
+    cap.release()
+    cv2.destroyAllWindows()
+    print("✓ Procesare încheiată")
 
-    if cv2.waitKey(1) == 27:  # ESC pentru a opri
-        break
 
-cap.release()
-cv2.destroyAllWindows()
-print("✓ Procesare încheiată")
+if __name__ == "__main__":
+    main()
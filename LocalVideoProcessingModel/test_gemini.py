@@ -5,12 +5,6 @@ import os
 import sys
 import json
 from datetime import datetime
-from dotenv import load_dotenv
-import google.generativeai as genai
-from PIL import Image
-
-# Încarcă variabilele de mediu din .env
-load_dotenv()
 
 # Configurație
 CAMERA_ID = "TM_Centru_01"
@@ -18,6 +12,8 @@ LOCATION_GPS = "45.7537, 21.2257"
 
 def test_gemini_connection():
     """Testează conexiunea la Gemini API"""
+    import google.generativeai as genai
+
     api_key = os.getenv('GEMINI_API_KEY')
     
     if not api_key or api_key == 'your_api_key_here':
@@ -141,6 +137,9 @@ def analyze_image_gemini(image_path, prompt):
     Returns:
         Răspunsul modelului
     """
+    import google.generativeai as genai
+    from PIL import Image
+
     print(f"\n{'='*60}")
     print(f"Analizare: {os.path.basename(image_path)}")
     print(f"{'='*60}")
@@ -244,7 +243,12 @@ Dacă NU există încălcare, răspunde doar:
         print(json.dumps(violations_found, indent=2, ensure_ascii=False))
 
 
-if __name__ == "__main__":
+def main():
+    from dotenv import load_dotenv
+
+    # Încarcă variabilele de mediu din .env
+    load_dotenv()
+
     print("="*60)
     print("Detecție Parcări Ilegale - Gemini Flash 2.5")
     print("="*60)
@@ -255,3 +259,7 @@ if __name__ == "__main__":
     
     # Rulează analiza pentru parcări ilegale
     analyze_parking_violations()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 const db = require('../config/database');
+const { applyFineToRollups } = require('../utils/incidentRollups');
 
 // Get all fines
 exports.getAllFines = async (req, res) => {
@@ -84,59 +85,87 @@ exports.createFine = async (req, res) => {
 
 // Update fine
 exports.updateFine = async (req, res) => {
+    const connection = await db.getConnection();
+
     try {
         const { id } = req.params;
         const { name, value } = req.body;
 
-        const [result] = await db.query(
-            'UPDATE fines SET name = ?, value = ? WHERE id = ?',
-            [name, value, id]
-        );
+        await connection.beginTransaction();
 
-        if (result.affectedRows === 0) {
+        // Lock the fine and move the revenue of incidents fined with it from the old value to the new one
+        const [existing] = await connection.query('SELECT id FROM fines WHERE id = ? FOR UPDATE', [id]);
+
+        if (existing.length === 0) {
+            await connection.rollback();
             return res.status(404).json({
                 success: false,
                 message: 'Fine not found'
             });
         }
 
+        await applyFineToRollups(connection, id, -1);
+        await connection.query(
+            'UPDATE fines SET name = ?, value = ? WHERE id = ?',
+            [name, value, id]
+        );
+        await applyFineToRollups(connection, id, 1);
+
+        await connection.commit();
+
         res.json({
             success: true,
             message: 'Fine updated successfully'
         });
     } catch (error) {
+        await connection.rollback();
         console.error('Error updating fine:', error);
         res.status(500).json({
             success: false,
             message: 'Server error',
             error: error.message
         });
+    } finally {
+        connection.release();
     }
 };
 
 // Delete fine
 exports.deleteFine = async (req, res) => {
+    const connection = await db.getConnection();
+
     try {
         const { id } = req.params;
-        const [result] = await db.query('DELETE FROM fines WHERE id = ?', [id]);
+
+        await connection.beginTransaction();
+
+        // Incidents fined with it no longer bring revenue: remove it from the rollups before deleting
+        await applyFineToRollups(connection, id, -1);
+        const [result] = await connection.query('DELETE FROM fines WHERE id = ?', [id]);
 
         if (result.affectedRows === 0) {
+            await connection.rollback();
             return res.status(404).json({
                 success: false,
                 message: 'Fine not found'
             });
         }
 
+        await connection.commit();
+
         res.json({
             success: true,
             message: 'Fine deleted successfully'
         });
     } catch (error) {
+        await connection.rollback();
         console.error('Error deleting fine:', error);
         res.status(500).json({
             success: false,
             message: 'Server error',
             error: error.message
         });
+    } finally {
+        connection.release();
     }
 };
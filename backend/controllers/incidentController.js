@@ -1,4 +1,5 @@
 const db = require('../config/database');
+const { applyIncidentToRollups } = require('../utils/incidentRollups');
 
 // Get all incidents
 exports.getAllIncidents = async (req, res) => {
@@ -131,6 +132,9 @@ exports.createIncident = async (req, res) => {
             );
         }
 
+        // Count the new incident in the analytics rollups
+        await applyIncidentToRollups(connection, incidentId, 1);
+
         await connection.commit();
 
         res.status(201).json({
@@ -160,6 +164,8 @@ exports.createIncident = async (req, res) => {
 
 // Update incident status
 exports.updateIncidentStatus = async (req, res) => {
+    const connection = await db.getConnection();
+
     try {
         const { id } = req.params;
         const { status, car_number, fine_id, admin_notes } = req.body;
@@ -194,15 +200,25 @@ exports.updateIncidentStatus = async (req, res) => {
             updateParams = [status, car_number || null, fine_id || null, admin_notes || null, id];
         }
 
-        const [result] = await db.query(updateQuery, updateParams);
+        await connection.beginTransaction();
 
-        if (result.affectedRows === 0) {
+        // Lock the incident and move it between rollup rows (old status/fine -> new)
+        const [existing] = await connection.query('SELECT id FROM incidents WHERE id = ? FOR UPDATE', [id]);
+
+        if (existing.length === 0) {
+            await connection.rollback();
             return res.status(404).json({
                 success: false,
                 message: 'Incident not found'
             });
         }
 
+        await applyIncidentToRollups(connection, id, -1);
+        await connection.query(updateQuery, updateParams);
+        await applyIncidentToRollups(connection, id, 1);
+
+        await connection.commit();
+
         res.json({
             success: true,
             message: 'Incident updated successfully'
@@ -223,39 +239,55 @@ exports.updateIncidentStatus = async (req, res) => {
             console.error('Failed to log user action:', logErr);
         }
     } catch (error) {
+        await connection.rollback();
         console.error('Error updating incident:', error);
         res.status(500).json({
             success: false,
             message: 'Server error',
             error: error.message
         });
+    } finally {
+        connection.release();
     }
 };
 
 // Delete incident
 exports.deleteIncident = async (req, res) => {
+    const connection = await db.getConnection();
+
     try {
         const { id } = req.params;
-        const [result] = await db.query('DELETE FROM incidents WHERE id = ?', [id]);
+
+        await connection.beginTransaction();
+
+        // Remove the incident from the rollups before deleting it
+        await applyIncidentToRollups(connection, id, -1);
+        const [result] = await connection.query('DELETE FROM incidents WHERE id = ?', [id]);
 
         if (result.affectedRows === 0) {
+            await connection.rollback();
             return res.status(404).json({
                 success: false,
                 message: 'Incident not found'
             });
         }
 
+        await connection.commit();
+
         res.json({
             success: true,
             message: 'Incident deleted successfully'
         });
     } catch (error) {
+        await connection.rollback();
         console.error('Error deleting incident:', error);
         res.status(500).json({
             success: false,
             message: 'Server error',
             error: error.message
         });
+    } finally {
+        connection.release();
     }
 };
 
@@ -289,17 +321,17 @@ exports.getIncidentsByStatus = async (req, res) => {
     }
 };
 
-// Get incident statistics
+// Get incident statistics (from the incident_rollups aggregates)
 exports.getIncidentStats = async (req, res) => {
     try {
         const [stats] = await db.query(`
       SELECT 
-        COUNT(*) as total,
-        SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending,
-        SUM(CASE WHEN status = 'resolved_and_fined' THEN 1 ELSE 0 END) as fined,
-        SUM(CASE WHEN status = 'resolved' THEN 1 ELSE 0 END) as resolved,
-        SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END) as rejected
-      FROM incidents
+        CAST(COALESCE(SUM(incidents), 0) AS SIGNED) as total,
+        CAST(COALESCE(SUM(CASE WHEN status = 'pending' THEN incidents ELSE 0 END), 0) AS SIGNED) as pending,
+        CAST(COALESCE(SUM(CASE WHEN status = 'resolved_and_fined' THEN incidents ELSE 0 END), 0) AS SIGNED) as fined,
+        CAST(COALESCE(SUM(CASE WHEN status = 'resolved' THEN incidents ELSE 0 END), 0) AS SIGNED) as resolved,
+        CAST(COALESCE(SUM(CASE WHEN status = 'rejected' THEN incidents ELSE 0 END), 0) AS SIGNED) as rejected
+      FROM incident_rollups
     `);
 
         res.json({
@@ -316,22 +348,22 @@ exports.getIncidentStats = async (req, res) => {
     }
 };
 
-// Get analytics data
+// Get analytics data (from the per day / district / status rollups, no incidents scan)
 exports.getAnalytics = async (req, res) => {
     try {
         const { startDate, endDate, district } = req.query;
 
-        // Build WHERE clause
+        // Build WHERE clause (rollups are per day, so the end date is inclusive)
         let whereConditions = [];
         let params = [];
 
         if (startDate && endDate) {
-            whereConditions.push('i.datetime BETWEEN ? AND ?');
+            whereConditions.push('day BETWEEN DATE(?) AND DATE(?)');
             params.push(startDate, endDate);
         }
 
         if (district && district !== 'all') {
-            whereConditions.push('i.district = ?');
+            whereConditions.push('district = ?');
             params.push(district);
         }
 
@@ -339,26 +371,27 @@ exports.getAnalytics = async (req, res) => {
             ? 'WHERE ' + whereConditions.join(' AND ')
             : '';
 
-        // Get total violations
+        // Get total violations, fines, revenue and reviewed incidents
         const [totalStats] = await db.query(`
             SELECT 
-                COUNT(*) as total_violations,
-                COALESCE(SUM(CASE WHEN i.status = 'resolved_and_fined' THEN 1 ELSE 0 END), 0) as fines_issued,
-                COALESCE(SUM(CASE WHEN i.status = 'resolved_and_fined' THEN COALESCE(f.value, 0) ELSE 0 END), 0) as revenue
-            FROM incidents i
-            LEFT JOIN fines f ON i.fine_id = f.id
+                CAST(COALESCE(SUM(incidents), 0) AS SIGNED) as total_violations,
+                CAST(COALESCE(SUM(CASE WHEN status = 'resolved_and_fined' THEN incidents ELSE 0 END), 0) AS SIGNED) as fines_issued,
+                COALESCE(SUM(revenue), 0) as revenue,
+                CAST(COALESCE(SUM(CASE WHEN status IN ('resolved_and_fined', 'resolved', 'rejected') THEN incidents ELSE 0 END), 0) AS SIGNED) as incidents_reviewed
+            FROM incident_rollups
             ${whereClause}
         `, params);
 
-        // Get violations over time (last 7 days)
+        // Get violations over time (last 7 days with incidents)
         const [violationsOverTime] = await db.query(`
             SELECT 
-                DATE_FORMAT(datetime, '%b %d') as date,
-                COUNT(*) as violations
-            FROM incidents i
+                DATE_FORMAT(day, '%b %d') as date,
+                CAST(SUM(incidents) AS SIGNED) as violations
+            FROM incident_rollups
             ${whereClause}
-            GROUP BY DATE(datetime), DATE_FORMAT(datetime, '%b %d')
-            ORDER BY DATE(datetime) DESC
+            GROUP BY day
+            HAVING violations > 0
+            ORDER BY day DESC
             LIMIT 7
         `, params);
 
@@ -370,21 +403,23 @@ exports.getAnalytics = async (req, res) => {
             const [districtStatsLastWeek] = await db.query(`
                 SELECT 
                     district,
-                    COUNT(*) as count
-                FROM incidents i
-                WHERE i.district = ?
-                  AND i.datetime >= DATE_SUB(NOW(), INTERVAL 7 DAY)
+                    CAST(SUM(incidents) AS SIGNED) as count
+                FROM incident_rollups
+                WHERE district = ?
+                  AND day > DATE_SUB(CURDATE(), INTERVAL 7 DAY)
                 GROUP BY district
+                HAVING count > 0
             `, [district]);
 
             // Also get total count for the selected period
             const [districtStatsTotal] = await db.query(`
                 SELECT 
                     district,
-                    COUNT(*) as count
-                FROM incidents i
+                    CAST(SUM(incidents) AS SIGNED) as count
+                FROM incident_rollups
                 ${whereClause}
                 GROUP BY district
+                HAVING count > 0
             `, params);
 
             if (districtStatsLastWeek.length > 0) {
@@ -428,22 +463,21 @@ exports.getAnalytics = async (req, res) => {
             const paramsForDistricts = [];
 
             if (startDate && endDate) {
-                whereConditionsForDistricts.push('datetime BETWEEN ? AND ?');
+                whereConditionsForDistricts.push('day BETWEEN DATE(?) AND DATE(?)');
                 paramsForDistricts.push(startDate, endDate);
             }
 
-            const whereClauseForDistricts = whereConditionsForDistricts.length > 0
-                ? 'WHERE ' + whereConditionsForDistricts.join(' AND ')
-                : '';
+            // Incidents without a district are stored under '' in the rollups
+            whereConditionsForDistricts.push("district <> ''");
 
             const [allDistricts] = await db.query(`
                 SELECT 
                     district,
-                    COUNT(*) as count
-                FROM incidents
-                ${whereClauseForDistricts}
+                    CAST(SUM(incidents) AS SIGNED) as count
+                FROM incident_rollups
+                WHERE ${whereConditionsForDistricts.join(' AND ')}
                 GROUP BY district
-                HAVING district IS NOT NULL
+                HAVING count > 0
                 ORDER BY count DESC
             `, paramsForDistricts);
 
@@ -468,22 +502,15 @@ exports.getAnalytics = async (req, res) => {
             }
         }
 
-        // Get incidents reviewed
-        const [reviewStats] = await db.query(`
-            SELECT 
-                COALESCE(SUM(CASE WHEN status IN ('resolved_and_fined', 'resolved', 'rejected') THEN 1 ELSE 0 END), 0) as incidents_reviewed
-            FROM incidents i
-            ${whereClause}
-        `, params);
-
         res.json({
             success: true,
             data: {
                 stats: {
                     total_violations: totalStats[0].total_violations || 0,
                     fines_issued: totalStats[0].fines_issued || 0,
-                    revenue: totalStats[0].revenue || 0,
-                    incidents_reviewed: reviewStats[0].incidents_reviewed || 0
+                    // SUM over DECIMAL comes back from mysql2 as a string ("1500.00")
+                    revenue: Number(totalStats[0].revenue) || 0,
+                    incidents_reviewed: totalStats[0].incidents_reviewed || 0
                 },
                 violations_over_time: violationsOverTime.reverse(),
                 district_overview: districtOverview
@@ -4,6 +4,7 @@ const cors = require('cors');
 const cookieParser = require('cookie-parser');
 const path = require('path');
 const db = require('./config/database');
+const { ensureRollupTable } = require('./utils/incidentRollups');
 
 const app = express();
 const PORT = process.env.PORT || 3000;
@@ -59,6 +60,13 @@ db.query(`CREATE TABLE IF NOT EXISTS user_actions (
     console.error('Failed to ensure user_actions table:', err);
 });
 
+// Ensure incident_rollups exists (and is backfilled) for the analytics endpoints
+ensureRollupTable().then(() => {
+    console.log('Ensured incident_rollups table exists');
+}).catch(err => {
+    console.error('Failed to ensure incident_rollups table:', err);
+});
+
 // Health check endpoint
 app.get('/health', (req, res) => {
     res.json({ status: 'OK', message: 'Server is running' });
@@ -0,0 +1,106 @@
+const db = require('../config/database');
+
+// Incremental aggregates for the analytics endpoints: one row per (day, district, status).
+// Kept in sync inside the same transaction as every insert / status change / delete
+// (and every fine value change or fine delete, since revenue depends on the fine),
+// so dashboard queries read a few hundred rollup rows instead of scanning incidents.
+// Incidents without a district are stored under '' (primary key columns cannot be NULL).
+
+const REVENUE_EXPR = "CASE WHEN i.status = 'resolved_and_fined' THEN COALESCE(f.value, 0) ELSE 0 END";
+
+/**
+ * Create the rollup table and backfill it from existing incidents when empty
+ * @returns {Promise<void>}
+ */
+async function ensureRollupTable() {
+    await db.query(`CREATE TABLE IF NOT EXISTS incident_rollups (
+        day DATE NOT NULL,
+        district VARCHAR(255) NOT NULL DEFAULT '',
+        status VARCHAR(32) NOT NULL,
+        incidents INT NOT NULL DEFAULT 0,
+        revenue DECIMAL(14,2) NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, district, status),
+        KEY idx_incident_rollups_district_day (district, day)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;`);
+
+    const [[{ count }]] = await db.query('SELECT COUNT(*) AS count FROM incident_rollups');
+    if (count === 0) {
+        await rebuildRollups();
+    }
+}
+
+/**
+ * Recompute all rollups from the incidents table (backfill / repair after manual edits)
+ * @returns {Promise<void>}
+ */
+async function rebuildRollups() {
+    const connection = await db.getConnection();
+    try {
+        await connection.beginTransaction();
+        await connection.query('DELETE FROM incident_rollups');
+        await connection.query(`
+            INSERT INTO incident_rollups (day, district, status, incidents, revenue)
+            SELECT DATE(i.datetime), COALESCE(i.district, ''), i.status, COUNT(*), SUM(${REVENUE_EXPR})
+            FROM incidents i
+            LEFT JOIN fines f ON i.fine_id = f.id
+            GROUP BY DATE(i.datetime), COALESCE(i.district, ''), i.status
+        `);
+        await connection.commit();
+    } catch (error) {
+        await connection.rollback();
+        throw error;
+    } finally {
+        connection.release();
+    }
+}
+
+/**
+ * Add (sign = 1) or remove (sign = -1) one incident's current row from the rollups.
+ * Must run on the caller's transaction connection, before a change with -1 and after it with +1.
+ * @param {object} connection - mysql2 connection inside a transaction
+ * @param {number|string} incidentId
+ * @param {number} sign - 1 or -1
+ * @returns {Promise<void>}
+ */
+async function applyIncidentToRollups(connection, incidentId, sign) {
+    await connection.query(`
+        INSERT INTO incident_rollups (day, district, status, incidents, revenue)
+        SELECT DATE(i.datetime), COALESCE(i.district, ''), i.status, ?, ? * ${REVENUE_EXPR}
+        FROM incidents i
+        LEFT JOIN fines f ON i.fine_id = f.id
+        WHERE i.id = ?
+        ON DUPLICATE KEY UPDATE
+            incident_rollups.incidents = incident_rollups.incidents + VALUES(incidents),
+            incident_rollups.revenue = incident_rollups.revenue + VALUES(revenue)
+    `, [sign, sign, incidentId]);
+}
+
+/**
+ * Add (sign = 1) or remove (sign = -1) the revenue of every fined incident that uses this fine.
+ * The fine's value is part of the rollups, so editing or deleting a fine must run on a transaction
+ * connection: -1 before the change and +1 after it (skip the +1 when the fine is deleted).
+ * @param {object} connection - mysql2 connection inside a transaction
+ * @param {number|string} fineId
+ * @param {number} sign - 1 or -1
+ * @returns {Promise<void>}
+ */
+async function applyFineToRollups(connection, fineId, sign) {
+    await connection.query(`
+        UPDATE incident_rollups r
+        JOIN (
+            SELECT DATE(i.datetime) AS day, COALESCE(i.district, '') AS district, SUM(f.value) AS revenue
+            FROM incidents i
+            JOIN fines f ON i.fine_id = f.id
+            WHERE i.fine_id = ? AND i.status = 'resolved_and_fined'
+            GROUP BY DATE(i.datetime), COALESCE(i.district, '')
+        ) fined ON r.day = fined.day AND r.district = fined.district AND r.status = 'resolved_and_fined'
+        SET r.revenue = r.revenue + ? * fined.revenue
+    `, [fineId, sign]);
+}
+
+module.exports = {
+    ensureRollupTable,
+    rebuildRollups,
+    applyIncidentToRollups,
+    applyFineToRollups
+};